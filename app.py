@@ -1,53 +1,281 @@
-from flask import Flask, request
+import atexit
+import concurrent.futures
+import functools
+import json
+import os
+import threading
+
+from flask import Flask, Response, jsonify, request
 import talanakombat as tk
+from talanakombat import cache
+from talanakombat import events
+from talanakombat import metrics
+from talanakombat import rosters
+from talanakombat import service
+from talanakombat import session
+from talanakombat import stats
 
 app = Flask(__name__)
 app.config['JSON_SORT_KEYS'] = False
+app.config['BATCH_WORKERS'] = int(os.environ.get(
+    'TALANAKOMBAT_BATCH_WORKERS', os.cpu_count() or 1))
+app.config['BATCH_CHUNKSIZE'] = int(os.environ.get(
+    'TALANAKOMBAT_BATCH_CHUNKSIZE', 16))
+app.config['CACHE_SIZE'] = int(os.environ.get(
+    'TALANAKOMBAT_CACHE_SIZE', 1024))
+app.config['CACHE_TTL'] = float(os.environ.get(
+    'TALANAKOMBAT_CACHE_TTL', 300))
+
+app.config['METRICS'] = os.environ.get(
+    'TALANAKOMBAT_METRICS', '').lower() in ('1', 'true', 'yes')
+
+if app.config['METRICS']:
+    metrics.enable()
+
+app.config['STATS'] = os.environ.get(
+    'TALANAKOMBAT_STATS', '').lower() in ('1', 'true', 'yes')
+
+if app.config['STATS']:
+    stats.enable()
+
+app.config['MAX_SESSIONS'] = int(os.environ.get(
+    'TALANAKOMBAT_MAX_SESSIONS', 1024))
+app.config['SESSION_TTL'] = float(os.environ.get(
+    'TALANAKOMBAT_SESSION_TTL', 3600))
+app.config['ROSTER'] = os.environ.get('TALANAKOMBAT_ROSTER', '')
+app.config['ROSTER_RELOAD_INTERVAL'] = float(os.environ.get(
+    'TALANAKOMBAT_ROSTER_RELOAD_INTERVAL', 1))
+
+PARSE_SECONDS = metrics.REGISTRY.histogram(
+    'talanakombat_request_parse_seconds', 'Time spent parsing /combat requests')
+FIGHT_SECONDS = metrics.REGISTRY.histogram(
+    'talanakombat_fight_seconds', 'Time spent playing /combat combats')
+SERIALIZE_SECONDS = metrics.REGISTRY.histogram(
+    'talanakombat_response_serialize_seconds', 'Time spent serializing /combat responses')
+
+executor = None
+executor_lock = threading.Lock()
+results_cache = cache.LRUCache(
+    max_size=app.config['CACHE_SIZE'], ttl=app.config['CACHE_TTL'])
+sessions = session.SessionStore(
+    max_sessions=app.config['MAX_SESSIONS'], ttl=app.config['SESSION_TTL'])
+roster_file = rosters.RosterFile(
+    app.config['ROSTER'], app.config['ROSTER_RELOAD_INTERVAL']) if app.config['ROSTER'] else None
+
+
+def get_executor() -> concurrent.futures.ProcessPoolExecutor:
+    # Requests are served by several threads, so the pool is created under a
+    # lock, once.
+    global executor
+    with executor_lock:
+        if executor is None:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=app.config['BATCH_WORKERS'])
+        return executor
+
+
+def shutdown_executor() -> None:
+    global executor
+    with executor_lock:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            executor = None
+
+
+atexit.register(shutdown_executor)
+
+
+def get_roster() -> rosters.Roster:
+    # Without a roster file the built-in characters are used. With one, it
+    # is reloaded when it changes, without restarting the service.
+    return roster_file.get() if roster_file is not None else rosters.BUILTIN
+
+
+def run(combat: tk.Combat, narration: bool = True, locale: str = 'en') -> dict:
+    with FIGHT_SECONDS.time():
+        return service.play_combat(combat, narration, locale)
+
+
+def wants_narration() -> bool:
+    return request.args.get('narration', 'true').lower() not in ('false', '0', 'no')
+
+
+def wants_locale() -> str:
+    return request.args.get('locale', 'en').lower()
+
+
+def locale_error() -> tuple[dict, int]:
+    return {'error': f"Locale must be one of {', '.join(events.LOCALES)}"}, 400
 
 
 @app.route('/combat', methods=['POST'])
 def index():
+    try:
+        with PARSE_SECONDS.time():
+            combat = service.prepare(request.get_json(), get_roster())
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return service.describe_error(e), 400
+    narration = wants_narration()
+    locale = wants_locale()
+    if locale not in events.LOCALES:
+        return locale_error()
+
+    # Results are cached with what their combat added to the stats, so a
+    # repeated combat is counted again without being played.
+    key = service.cache_key(combat, narration, locale)
+    cached = None if key is None else results_cache.get(key)
+    if cached is None:
+        result = run(combat, narration, locale)
+        if key is not None:
+            results_cache.put(key, (result, combat.stats_record))
+    else:
+        result, record = cached
+        if record is not None and stats.enabled:
+            stats.STATS.add(record)
+
+    with SERIALIZE_SECONDS.time():
+        return jsonify(result)
+
+
+@app.route('/characters', methods=['GET'])
+def list_characters():
+    roster = get_roster()
+    return {
+        'digest': roster.digest,
+        **roster.to_dict(),
+        'error': roster_file.error if roster_file is not None else None,
+    }
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_text():
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/stats', methods=['GET'])
+def stats_summary():
+    return {'enabled': stats.enabled, **stats.STATS.to_dict()}
+
+
+@app.route('/combat/cache', methods=['GET'])
+def cache_stats():
+    return results_cache.stats()
+
+
+@app.route('/combat/batch', methods=['POST'])
+def batch():
     data = request.get_json()
+    if type(data) is not list:
+        return {'error': 'Body must be a list of combats'}, 400
+    locale = wants_locale()
+    if locale not in events.LOCALES:
+        return locale_error()
 
-    p1 = data['jugador1'] if 'jugador1' in data else data['player1']
-    p2 = data['jugador2'] if 'jugador2' in data else data['player2']
+    narration = wants_narration()
+    roster = get_roster()
+    if app.config['BATCH_WORKERS'] <= 1 or len(data) <= 1:
+        results = [service.play_safely(item, narration, locale, roster) for item in data]
+    else:
+        # The worker processes have their own metrics and stats, so they send
+        # back what each combat added and it is counted here.
+        play_item = functools.partial(
+            service.play_recorded, narration=narration, locale=locale, roster=roster,
+            record=metrics.enabled or stats.enabled)
+        results = []
+        for result, record in get_executor().map(play_item, data, chunksize=app.config['BATCH_CHUNKSIZE']):
+            if record is not None:
+                service.count_record(record)
+            results.append(result)
 
-    p1_m = p1['movimientos'] if 'movimientos' in p1 else p1['movements']
-    p2_m = p2['movimientos'] if 'movimientos' in p2 else p2['movements']
+    return {'results': results}
 
-    p1_a = p1['golpes'] if 'golpes' in p1 else p1['attacks']
-    p2_a = p2['golpes'] if 'golpes' in p2 else p2['attacks']
 
-    player1moves = [f"{m}+{a}" if m != '' and a !=
-                    '' else m or a for m, a in zip(p1_m, p1_a)]
-    player2moves = [f"{m}+{a}" if m != '' and a !=
-                    '' else m or a for m, a in zip(p2_m, p2_a)]
+def stream_events(combat: tk.Combat, sse: bool, locale: str = 'en'):
+    def event(name: str, payload: dict) -> str:
+        if sse:
+            return f"event: {name}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps({'event': name, **payload}) + '\n'
 
-    player1 = tk.TonynStallone()
-    player2 = tk.ArnaldorShuatseneguer()
+    try:
+        for description in combat.fight(locale):
+            yield event('narration', {'narration': description})
+    except (AttributeError, TypeError, ValueError) as e:
+        yield event('error', {'error': f"{type(e).__name__}: {e}"})
+        return
 
-    combat = tk.Combat(
-        player1=player1,
-        player2=player2,
-        player1moves=player1moves,
-        player2moves=player2moves
-    )
+    yield event('summary', service.summarize(combat))
 
-    gen = combat.fight()
 
-    narration = [move for move in gen]
+@app.route('/combat/stream', methods=['POST'])
+def stream():
+    # Errors found once the response has started can only be sent as an
+    # event, so everything that can be checked up front is checked here.
+    try:
+        combat = service.prepare(request.get_json(), get_roster())
+        combat.check_ready()
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return service.describe_error(e), 400
+    locale = wants_locale()
+    if locale not in events.LOCALES:
+        return locale_error()
 
-    return {
-        'winner': player1.name if player1.is_alive() else player2.name,
-        'narration': narration,
-        'player1': {
-            'name': player1.name,
-            'health': player1.health,
-            'moves': player1moves,
-        },
-        'player2': {
-            'name': player2.name,
-            'health': player2.health,
-            'moves': player2moves,
-        }
-    }
+    sse = request.accept_mimetypes.best_match(
+        ['application/x-ndjson', 'text/event-stream']) == 'text/event-stream'
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+
+    return Response(stream_events(combat, sse, locale), mimetype=mimetype)
+
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    data = request.get_json(silent=True) or {}
+    locale = wants_locale()
+    if locale not in events.LOCALES:
+        return locale_error()
+
+    roster = get_roster()
+    try:
+        p1 = service.get_player(data, 1, required=False)
+        p2 = service.get_player(data, 2, required=False)
+        live = sessions.create(
+            player1=service.get_character(p1, roster, 1),
+            player2=service.get_character(p2, roster, 2),
+            seed=service.get_seed(data),
+            locale=locale)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return service.describe_error(e), 400
+
+    return live.state(), 201
+
+
+@app.route('/sessions/<session_id>', methods=['GET'])
+def get_session(session_id: str):
+    live = sessions.get(session_id)
+    if live is None:
+        return {'error': 'Session not found'}, 404
+
+    return live.state()
+
+
+@app.route('/sessions/<session_id>/turns', methods=['POST'])
+def play_session_turn(session_id: str):
+    live = sessions.get(session_id)
+    if live is None:
+        return {'error': 'Session not found'}, 404
+
+    data = request.get_json()
+    try:
+        p1 = service.get_player(data, 1)
+        p2 = service.get_player(data, 2)
+        return live.play_turn(service.get_move(p1), service.get_move(p2))
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return service.describe_error(e), 400
+
+
+@app.route('/sessions/<session_id>', methods=['DELETE'])
+def finish_session(session_id: str):
+    live = sessions.delete(session_id)
+    if live is None:
+        return {'error': 'Session not found'}, 404
+
+    return live.finish()
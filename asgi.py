@@ -0,0 +1,137 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import urllib.parse
+
+from talanakombat import events
+from talanakombat import rosters
+from talanakombat import service
+
+OFFLOAD_THRESHOLD = int(os.environ.get('TALANAKOMBAT_OFFLOAD_THRESHOLD', 1000))
+WORKERS = int(os.environ.get('TALANAKOMBAT_ASGI_WORKERS', os.cpu_count() or 1))
+MAX_BODY_SIZE = int(os.environ.get('TALANAKOMBAT_MAX_BODY_SIZE', 16 * 1024 * 1024))
+ROSTER = os.environ.get('TALANAKOMBAT_ROSTER', '')
+ROSTER_RELOAD_INTERVAL = float(os.environ.get('TALANAKOMBAT_ROSTER_RELOAD_INTERVAL', 1))
+
+executor = None
+roster_file = rosters.RosterFile(ROSTER, ROSTER_RELOAD_INTERVAL) if ROSTER else None
+
+
+def get_executor() -> concurrent.futures.ProcessPoolExecutor:
+    global executor
+    if executor is None:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=WORKERS)
+    return executor
+
+
+def shutdown_executor() -> None:
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
+
+
+async def read_body(receive) -> bytes:
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ConnectionError('Client disconnected')
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_SIZE:
+            raise ValueError('Request body is too large')
+        if not message.get('more_body', False):
+            return bytes(body)
+
+
+async def send_json(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def request_turns(data: dict) -> int:
+    # The longest raw move list, read without parsing or validating anything,
+    # so the loop can decide where a combat is played at no cost.
+    try:
+        players = (service.get_player(data, 1), service.get_player(data, 2))
+    except (KeyError, TypeError):
+        return 0
+    return max((len(moves) for player in players for moves in player.values() if type(moves) is list), default=0)
+
+
+def query_param(scope: dict, name: str, default: str) -> str:
+    query = urllib.parse.parse_qs(scope.get('query_string', b'').decode())
+    return query.get(name, [default])[-1].lower()
+
+
+def wants_narration(scope: dict) -> bool:
+    return query_param(scope, 'narration', 'true') not in ('false', '0', 'no')
+
+
+def wants_locale(scope: dict) -> str:
+    return query_param(scope, 'locale', 'en')
+
+
+async def combat(scope: dict, receive, send) -> None:
+    try:
+        data = json.loads(await read_body(receive))
+    except ValueError as e:
+        return await send_json(send, 400, {'error': f"{type(e).__name__}: {e}"})
+
+    narration = wants_narration(scope)
+    locale = wants_locale(scope)
+    if locale not in events.LOCALES:
+        return await send_json(send, 400, {'error': f"Locale must be one of {', '.join(events.LOCALES)}"})
+
+    roster = roster_file.get() if roster_file is not None else rosters.BUILTIN
+    try:
+        # Short combats take microseconds, so they run on the loop. Long ones
+        # go to a worker process with the raw request, which is cheaper to
+        # pickle than the combat, and are parsed, validated and played there
+        # so none of their work stalls the loop.
+        if request_turns(data) > OFFLOAD_THRESHOLD:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(get_executor(), service.play, data, narration, locale, roster)
+        else:
+            result = service.play(data, narration, locale, roster)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return await send_json(send, 400, service.describe_error(e))
+
+    await send_json(send, 200, result)
+
+
+async def lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            shutdown_executor()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope: dict, receive, send) -> None:
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    if scope['path'] != '/combat':
+        return await send_json(send, 404, {'error': 'Not found'})
+    if scope['method'] != 'POST':
+        return await send_json(send, 405, {'error': 'Method not allowed'})
+
+    try:
+        await combat(scope, receive, send)
+    except ConnectionError:
+        pass
@@ -0,0 +1,196 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import talanakombat as tk
+
+LENGTHS = [5, 100, 1000, 10000, 100000]
+
+
+def random_move(rng: random.Random, attacks: tuple[str, ...]) -> str:
+    movement = ''.join(rng.choice('WASD') for _ in range(rng.randint(0, 5)))
+    attack = rng.choice(attacks)
+    return f"{movement}+{attack}" if movement and attack else movement or attack
+
+
+def random_moves(length: int, seed: int, attacks: tuple[str, ...] = ('', '', 'P', 'K')) -> list[str]:
+    rng = random.Random(seed)
+    return [random_move(rng, attacks) for _ in range(length)]
+
+
+def immortal(character: tk.BaseCharacter) -> tk.BaseCharacter:
+    # Long combats need players that survive every turn, otherwise the fight
+    # stops at the first death and the length stops mattering.
+    return type(character)(health=2 ** 62)
+
+
+def measure(function, number: int, repeat: int = 5) -> dict:
+    times = timeit.repeat(function, number=number, repeat=repeat)
+    best = min(times) / number
+    return {
+        'number': number,
+        'repeat': repeat,
+        'best': best,
+        'mean': sum(times) / len(times) / number,
+    }
+
+
+def bench_characters(results: dict, moves: list[str]) -> None:
+    character = tk.TonynStallone()
+    movements = [character.is_special_attack(move)[0] for move in moves]
+    number = len(moves)
+    plays = itertools.cycle(moves)
+    results['is_special_attack'] = measure(
+        lambda: character.is_special_attack(next(plays)), number)
+    plays = itertools.cycle(movements)
+    results['describe_movement'] = measure(
+        lambda: tk.BaseCharacter.describe_movement(next(plays)), number)
+    plays = itertools.cycle(moves)
+    results['make_move'] = measure(
+        lambda: character.make_move(next(plays)), number)
+
+    combat = tk.Combat(player1=tk.TonynStallone(),
+                       player2=tk.ArnaldorShuatseneguer())
+    pairs = itertools.cycle(list(zip(moves, reversed(moves))))
+    results['decide_order'] = measure(
+        lambda: combat.decide_order(*next(pairs)), number)
+
+
+def bench_fight(results: dict, lengths: list[int]) -> None:
+    for length in lengths:
+        player1moves = random_moves(length, seed=1)
+        player2moves = random_moves(length, seed=2)
+
+        def fight():
+            combat = tk.Combat(player1=immortal(tk.TonynStallone()),
+                               player2=immortal(tk.ArnaldorShuatseneguer()),
+                               player1moves=list(player1moves),
+                               player2moves=list(player2moves),
+                               seed=0)
+            for _ in combat.fight():
+                pass
+
+        number = max(1, 10000 // length)
+        results[f"fight[{length}]"] = measure(fight, number, repeat=3)
+
+
+def import_time(module: str) -> float:
+    # -X importtime reports the cumulative microseconds of every import, the
+    # module's own line covers everything it pulled in.
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=ROOT, check=True, capture_output=True, text=True).stderr
+    for line in stderr.splitlines():
+        _, cumulative, name = (part.strip() for part in line.split(':', 1)[1].split('|'))
+        if name == module:
+            return int(cumulative) / 1e6
+    raise RuntimeError(f"{module} was not imported")
+
+
+def bench_imports(results: dict) -> None:
+    # Each import runs in a new interpreter, as in a cold start.
+    for module in ('talanakombat', 'talanakombat.service'):
+        times = [import_time(module) for _ in range(5)]
+        results[f"import[{module}]"] = {
+            'number': 1,
+            'repeat': len(times),
+            'best': min(times),
+            'mean': sum(times) / len(times),
+        }
+
+
+def bench_rest(results: dict) -> None:
+    try:
+        from app import app, results_cache
+    except ImportError:
+        print('Skipping REST benchmarks, flask is not installed', file=sys.stderr)
+        return
+
+    client = app.test_client()
+    body = {
+        'player1': {
+            'movements': ['D', 'DSD', 'S', 'DSD', 'SD'],
+            'attacks': ['K', 'P', '', 'K', 'P'],
+        },
+        'player2': {
+            'movements': ['SA', 'SA', 'SA', 'ASA', 'SA'],
+            'attacks': ['K', '', 'K', 'P', 'P'],
+        },
+    }
+    results['rest[/combat]'] = measure(
+        lambda: client.post('/combat', json=body), number=200)
+
+    def resolve():
+        results_cache.clear()
+        client.post('/combat?narration=false', json=body)
+
+    results['rest[/combat?narration=false]'] = measure(resolve, number=200)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['best'] / baseline[name]['best']
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {baseline[name]['best'] * 1e6:.3f}us -> {result['best'] * 1e6:.3f}us ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Talana Kombat benchmarks')
+    parser.add_argument('--output', default='bench_output.json',
+                        help='file where the results are saved as JSON')
+    parser.add_argument('--compare', default=None,
+                        help='previous results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='slowdown ratio flagged as a regression')
+    parser.add_argument('--lengths', type=int, nargs='+', default=LENGTHS,
+                        help='move list lengths for the combat benchmarks')
+    parser.add_argument('--no-rest', action='store_true',
+                        help='skip the REST endpoint benchmarks')
+    args = parser.parse_args()
+
+    results = {}
+    bench_imports(results)
+    bench_characters(results, random_moves(1000, seed=0))
+    bench_fight(results, args.lengths)
+    if not args.no_rest:
+        bench_rest(results)
+
+    for name, result in results.items():
+        print(f"{name:40} {result['best'] * 1e6:12.3f}us")
+
+    with open(args.output, 'w') as output:
+        json.dump({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'results': results,
+        }, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as previous:
+            regressions = compare(
+                results, json.load(previous)['results'], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import http.client
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import threading
+import time
+import urllib.parse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+SERVERS = ('flask', 'asgi')
+
+
+def synthetic_matches(count: int, length: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+
+    def player() -> dict:
+        return {
+            'movements': [''.join(rng.choice('WASD') for _ in range(rng.randint(0, 3)))
+                          for _ in range(length)],
+            'attacks': [rng.choice(('', 'P', 'K')) for _ in range(length)],
+        }
+
+    return [{'player1': player(), 'player2': player()} for _ in range(count)]
+
+
+def read_matches(path: str) -> list[dict]:
+    with open(path) as source:
+        return [json.loads(line) for line in source if line.strip()]
+
+
+def percentile(values: list[float], percent: float) -> float:
+    # Nearest rank, so the result is always one of the measured values.
+    if not values:
+        return 0.0
+    rank = max(1, round(percent / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def serve_flask(port_queue) -> None:
+    import logging
+    from werkzeug.serving import make_server
+    from app import app
+
+    # One log line per request would cost as much as the request itself.
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def serve_asgi(port_queue) -> None:
+    import asgi
+
+    try:
+        import uvicorn
+    except ImportError:
+        uvicorn = None
+
+    if uvicorn is not None:
+        import socket
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port_queue.put(sock.getsockname()[1])
+        config = uvicorn.Config(asgi.app, log_level='warning', lifespan='on')
+        uvicorn.Server(config).run(sockets=[sock])
+        return
+
+    # Without an ASGI server installed, requests are bridged to the app by a
+    # minimal HTTP/1.1 server on asyncio: enough for keep-alive JSON posts.
+    async def handle(reader, writer) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = []
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, value = line.decode('latin-1').split(':', 1)
+                    headers.append((name.strip().lower().encode(), value.strip().encode()))
+                    if name.strip().lower() == 'content-length':
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b''
+
+                path, _, query = target.partition('?')
+                scope = {
+                    'type': 'http',
+                    'asgi': {'version': '3.0'},
+                    'http_version': '1.1',
+                    'method': method,
+                    'path': urllib.parse.unquote(path),
+                    'query_string': query.encode(),
+                    'headers': headers,
+                }
+                messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+                response = {}
+
+                async def receive() -> dict:
+                    return messages.pop() if messages else {'type': 'http.disconnect'}
+
+                async def send(message: dict) -> None:
+                    if message['type'] == 'http.response.start':
+                        response['status'] = message['status']
+                        response['headers'] = message.get('headers', [])
+                    else:
+                        response.setdefault('body', bytearray()).extend(message.get('body', b''))
+
+                await asgi.app(scope, receive, send)
+                head = [f"HTTP/1.1 {response['status']} {http.client.responses.get(response['status'], '')}"]
+                head += [f"{name.decode()}: {value.decode()}" for name, value in response['headers']]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + bytes(response.get('body', b'')))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def main() -> None:
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port_queue.put(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+class Service:
+    # Each service runs in its own process, so the load generator and the
+    # server don't compete for the same interpreter lock.
+    def __init__(self, name: str) -> None:
+        if name not in SERVERS:
+            raise ValueError(f"Server must be one of {', '.join(SERVERS)}")
+        self.__name = name
+        self.__process = None
+
+    def __enter__(self) -> str:
+        port_queue = multiprocessing.Queue()
+        target = serve_flask if self.__name == 'flask' else serve_asgi
+        self.__process = multiprocessing.Process(target=target, args=(port_queue,), daemon=True)
+        self.__process.start()
+        port = port_queue.get(timeout=30)
+        return f"http://127.0.0.1:{port}"
+
+    def __exit__(self, *args) -> None:
+        self.__process.terminate()
+        self.__process.join()
+
+
+def run_load(url: str, bodies: list[bytes], **kwargs) -> dict:
+    concurrency = kwargs.get('concurrency', 8)
+    rate = kwargs.get('rate', None)
+    query = kwargs.get('query', '')
+
+    parsed = urllib.parse.urlsplit(url)
+    path = (parsed.path.rstrip('/') or '') + '/combat' + (f"?{query}" if query else '')
+    indexes = itertools.count()
+    lock = threading.Lock()
+    latencies = []
+    errors = []
+
+    start = time.perf_counter()
+
+    def worker() -> None:
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+        local_latencies = []
+        local_errors = 0
+        while True:
+            with lock:
+                index = next(indexes)
+            if index >= len(bodies):
+                break
+
+            # At a fixed rate each request has a scheduled time, and its
+            # latency counts from then, so a slow server can't hide its queue.
+            scheduled = start + index / rate if rate else time.perf_counter()
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                connection.request('POST', path, body=bodies[index],
+                                   headers={'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+            local_latencies.append(time.perf_counter() - scheduled)
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        'requests': total,
+        'errors': sum(errors),
+        'error_rate': sum(errors) / total if total else 0.0,
+        'seconds': elapsed,
+        'rps': total / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'max': latencies[-1] if latencies else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Talana Kombat load test')
+    parser.add_argument('--servers', nargs='+', default=list(SERVERS), choices=SERVERS,
+                        help='serving modes started locally and compared')
+    parser.add_argument('--url', default=None,
+                        help='test an already running service instead of starting one')
+    parser.add_argument('--input', default=None,
+                        help='JSONL file with one /combat request body per line')
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='number of requests sent to each service')
+    parser.add_argument('--length', type=int, default=10,
+                        help='turns of each synthetic match')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the synthetic matches')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='number of concurrent connections')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='target requests per second (as fast as possible by default)')
+    parser.add_argument('--warmup', type=int, default=50,
+                        help='requests sent before measuring')
+    parser.add_argument('--no-narration', action='store_true',
+                        help='request combats without narration')
+    parser.add_argument('--output', default='loadtest_output.json',
+                        help='file where the results are saved as JSON')
+    args = parser.parse_args()
+
+    matches = read_matches(args.input) if args.input else synthetic_matches(args.requests, args.length, args.seed)
+    if not matches:
+        parser.error('No matches to send')
+    bodies = [json.dumps(match).encode() for match in itertools.islice(itertools.cycle(matches), args.requests)]
+    query = 'narration=false' if args.no_narration else ''
+
+    def measure(url: str) -> dict:
+        if args.warmup:
+            run_load(url, bodies[:args.warmup], concurrency=args.concurrency, query=query)
+        return run_load(url, bodies, concurrency=args.concurrency, rate=args.rate, query=query)
+
+    results = {}
+    if args.url:
+        results[args.url] = measure(args.url)
+    else:
+        for name in args.servers:
+            with Service(name) as url:
+                results[name] = measure(url)
+
+    print(f"{'server':10} {'rps':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for name, result in results.items():
+        print(f"{name:10} {result['rps']:10.1f} {result['p50'] * 1e3:10.2f} {result['p95'] * 1e3:10.2f} "
+              f"{result['p99'] * 1e3:10.2f} {result['error_rate']:8.2%}")
+
+    with open(args.output, 'w') as output:
+        json.dump({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'options': {
+                'requests': args.requests,
+                'concurrency': args.concurrency,
+                'rate': args.rate,
+                'narration': not args.no_narration,
+                'input': args.input,
+            },
+            'results': results,
+        }, output, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,27 @@
-from .characters import BaseCharacter
-from .characters import TonynStallone
-from .characters import ArnaldorShuatseneguer
-from .combat import Combat
-from .exceptions import DeadPlayerException
+# The public names are imported the first time they are used, so importing
+# the package (or just one of its modules) only loads what is needed.
+EXPORTS = {
+    'BaseCharacter': 'characters',
+    'CharacterTemplate': 'characters',
+    'TonynStallone': 'characters',
+    'ArnaldorShuatseneguer': 'characters',
+    'Combat': 'combat',
+    'DeadPlayerException': 'exceptions',
+}
+
+__all__ = list(EXPORTS)
+
+
+def __getattr__(name: str):
+    module = EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,112 @@
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+
+from talanakombat import service
+
+
+def play_lines(lines: list[str], narration: bool) -> list[str]:
+    results = []
+    for line in lines:
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            result = {'error': f"{type(e).__name__}: {e}"}
+        else:
+            result = service.play_safely(data, narration)
+        results.append(json.dumps(result))
+    return results
+
+
+def read_chunks(source, chunksize: int):
+    chunk = []
+    for line in source:
+        if not line.strip():
+            continue
+        chunk.append(line)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_results(output, results: list[str]) -> int:
+    for result in results:
+        output.write(result)
+        output.write('\n')
+    return len(results)
+
+
+def replay(source, output, **kwargs) -> int:
+    workers = kwargs.get('workers', os.cpu_count() or 1)
+    chunksize = kwargs.get('chunksize', 64)
+    max_in_flight = kwargs.get('max_in_flight', None) or workers * 4
+    narration = kwargs.get('narration', True)
+
+    chunks = read_chunks(source, chunksize)
+    if workers <= 1:
+        return sum(write_results(output, play_lines(chunk, narration)) for chunk in chunks)
+
+    # The pool is only loaded when it's used, single worker runs (like
+    # serverless functions) start faster without it.
+    import concurrent.futures
+
+    # At most max_in_flight chunks are read ahead of the output, and they are
+    # written in submission order, so memory stays flat and order is stable.
+    total = 0
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in chunks:
+            if len(pending) >= max_in_flight:
+                total += write_results(output, pending.popleft().result())
+            pending.append(executor.submit(play_lines, chunk, narration))
+        while pending:
+            total += write_results(output, pending.popleft().result())
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m talanakombat',
+        description='Replay combats from a JSONL file, one /combat request per line')
+    parser.add_argument('input', help="JSONL file with one combat per line, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-',
+                        help="JSONL file where results are written, or '-' for stdout")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='number of worker processes')
+    parser.add_argument('-c', '--chunksize', type=int, default=64,
+                        help='combats sent to a worker at a time')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='chunks being played at the same time (defaults to 4 per worker)')
+    parser.add_argument('--no-narration', action='store_true',
+                        help='only compute the outcome of each combat')
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+
+    start = time.perf_counter()
+    try:
+        total = replay(source, output,
+                       workers=args.workers,
+                       chunksize=args.chunksize,
+                       max_in_flight=args.max_in_flight,
+                       narration=not args.no_narration)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{total} combats in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} combats/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
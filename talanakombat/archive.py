@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+
+from talanakombat import characters
+from talanakombat.combat import Combat
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+# Characters are stored by their position here, so new ones must be added at
+# the end.
+CHARACTERS = (characters.TonynStallone, characters.ArnaldorShuatseneguer)
+
+ATTACKS = ('', 'P', 'K')
+
+# Every move the REST API can produce is one of the 1365 movements followed by
+# one of the 3 attacks, so its position in this list fits in 12 bits and a
+# turn, one move per player, in 3 bytes. The last code is left for moves that
+# aren't in the list, which are stored as strings after the turns.
+MOVES = [f"{movement}+{attack}" if movement and attack else movement or attack
+         for movement in characters.MOVEMENTS
+         for attack in ATTACKS]
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+ESCAPE = 0xFFF
+
+MAGIC = b'TKRP\x01\x00\x00\x00'
+SEED_NONE = 0
+SEED_INT = 1
+SEED_STR = 2
+
+HEADER = struct.Struct('<BBBI')
+LENGTH = struct.Struct('<I')
+OFFSET = struct.Struct('<Q')
+INT_SEED = struct.Struct('<q')
+SHORT = struct.Struct('<H')
+
+
+def character_id(player: characters.BaseCharacter) -> int:
+    if type(player) not in CHARACTERS or player.template is not type(player).TEMPLATE:
+        names = ', '.join(cls.__name__ for cls in CHARACTERS)
+        raise ValueError(f"Only the characters {names} with their default templates can be archived")
+    return CHARACTERS.index(type(player))
+
+
+def encode(combat: Combat) -> bytes:
+    combat.check_ready()
+    player1 = character_id(combat.player1)
+    player2 = character_id(combat.player2)
+
+    seed = combat.seed
+    if seed is None:
+        seed_kind, seed_bytes = SEED_NONE, b''
+    elif type(seed) is int and -2 ** 63 <= seed < 2 ** 63:
+        seed_kind, seed_bytes = SEED_INT, INT_SEED.pack(seed)
+    elif type(seed) is str:
+        seed_bytes = seed.encode()
+        seed_kind, seed_bytes = SEED_STR, SHORT.pack(len(seed_bytes)) + seed_bytes
+    else:
+        raise TypeError('Seed must be None, a 64 bit integer or a string')
+
+    turns = bytearray()
+    escapes = bytearray()
+    for player1move, player2move in zip(combat.player1moves, combat.player2moves):
+        codes = []
+        for move in (player1move, player2move):
+            code = MOVE_CODES.get(move, ESCAPE)
+            if code == ESCAPE:
+                if type(move) is not str:
+                    raise TypeError('Moves must be strings')
+                move = move.encode()
+                escapes += SHORT.pack(len(move)) + move
+            codes.append(code)
+        packed = codes[0] | codes[1] << 12
+        turns += packed.to_bytes(3, 'little')
+
+    return b''.join((
+        HEADER.pack(seed_kind, player1, player2, len(combat.player1moves)),
+        seed_bytes, turns, escapes,
+    ))
+
+
+def decode(data: typing.Union[bytes, memoryview]) -> dict:
+    data = bytes(data)
+    seed_kind, player1, player2, turns = HEADER.unpack_from(data)
+    position = HEADER.size
+
+    seed = None
+    if seed_kind == SEED_INT:
+        seed = INT_SEED.unpack_from(data, position)[0]
+        position += INT_SEED.size
+    elif seed_kind == SEED_STR:
+        length = SHORT.unpack_from(data, position)[0]
+        position += SHORT.size
+        seed = data[position:position + length].decode()
+        position += length
+    elif seed_kind != SEED_NONE:
+        raise ValueError('Unknown seed kind')
+
+    escapes = position + 3 * turns
+    player1moves = []
+    player2moves = []
+    for start in range(position, position + 3 * turns, 3):
+        packed = int.from_bytes(data[start:start + 3], 'little')
+        for moves, code in ((player1moves, packed & 0xFFF), (player2moves, packed >> 12)):
+            if code == ESCAPE:
+                length = SHORT.unpack_from(data, escapes)[0]
+                escapes += SHORT.size
+                moves.append(data[escapes:escapes + length].decode())
+                escapes += length
+            else:
+                moves.append(MOVES[code])
+
+    return {
+        'player1': player1,
+        'player2': player2,
+        'seed': seed,
+        'player1moves': player1moves,
+        'player2moves': player2moves,
+    }
+
+
+def replay(record: typing.Union[bytes, memoryview, dict]) -> Combat:
+    if type(record) is not dict:
+        record = decode(record)
+
+    try:
+        player1 = CHARACTERS[record['player1']]()
+        player2 = CHARACTERS[record['player2']]()
+    except IndexError:
+        raise ValueError('Unknown character id') from None
+
+    return Combat(
+        player1=player1,
+        player2=player2,
+        player1moves=record['player1moves'],
+        player2moves=record['player2moves'],
+        seed=record['seed'],
+    )
+
+
+class Archive:
+    # Records are appended to the data file, each one prefixed by its length,
+    # and the offset of each record is appended to an index file next to it.
+    # Both are memory-mapped for reading, so a record is found by its match id
+    # without reading the rest of the archive. An archive has a single writer.
+    def __init__(self, path: str) -> None:
+        self.__path = path
+        self.__index_path = path + '.idx'
+        self.__data_map = None
+        self.__index_map = None
+
+        with open(self.__path, 'ab+') as data:
+            data.seek(0)
+            magic = data.read(len(MAGIC))
+            if not magic:
+                data.write(MAGIC)
+            elif magic != MAGIC:
+                raise ValueError(f"{path} is not a replay archive")
+        with open(self.__index_path, 'ab'):
+            pass
+
+        self.__data = open(self.__path, 'ab')
+        self.__index = open(self.__index_path, 'ab')
+
+    def __enter__(self) -> 'Archive':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__index.tell() // OFFSET.size
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def append(self, combat: Combat) -> int:
+        return self.append_record(encode(combat))
+
+    def append_record(self, record: bytes) -> int:
+        # The record is written before its offset, so an interrupted append
+        # leaves at most some unindexed bytes at the end of the data file.
+        offset = self.__data.seek(0, os.SEEK_END)
+        self.__data.write(LENGTH.pack(len(record)) + record)
+        self.__data.flush()
+        match_id = len(self)
+        self.__index.write(OFFSET.pack(offset))
+        self.__index.flush()
+        return match_id
+
+    def remap(self) -> None:
+        self.unmap()
+        if os.path.getsize(self.__index_path):
+            with open(self.__index_path, 'rb') as index:
+                self.__index_map = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ)
+            with open(self.__path, 'rb') as data:
+                self.__data_map = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def unmap(self) -> None:
+        for mapped in (self.__data_map, self.__index_map):
+            if mapped is not None:
+                mapped.close()
+        self.__data_map = self.__index_map = None
+
+    def read(self, match_id: int) -> bytes:
+        if type(match_id) is not int or not 0 <= match_id < len(self):
+            raise KeyError(match_id)
+
+        # The maps are only rebuilt when they don't cover a record appended
+        # since they were made.
+        if self.__index_map is None or len(self.__index_map) < (match_id + 1) * OFFSET.size:
+            self.remap()
+
+        offset = OFFSET.unpack_from(self.__index_map, match_id * OFFSET.size)[0]
+        length = LENGTH.unpack_from(self.__data_map, offset)[0]
+        start = offset + LENGTH.size
+        return self.__data_map[start:start + length]
+
+    def get(self, match_id: int) -> dict:
+        return decode(self.read(match_id))
+
+    def replay(self, match_id: int) -> Combat:
+        return replay(self.get(match_id))
+
+    def __iter__(self) -> typing.Iterator[dict]:
+        for match_id in range(len(self)):
+            yield self.get(match_id)
+
+    def close(self) -> None:
+        self.unmap()
+        self.__data.close()
+        self.__index.close()
@@ -0,0 +1,118 @@
+import numpy as np
+
+from talanakombat import characters
+
+
+class BatchCombat:
+    def __init__(self, **kwargs) -> None:
+        player1 = kwargs.get('player1', None) or characters.TonynStallone()
+        player2 = kwargs.get('player2', None) or characters.ArnaldorShuatseneguer()
+        if not isinstance(player1, characters.BaseCharacter):
+            raise TypeError('Player 1 must be a characters.BaseCharacter')
+        if not isinstance(player2, characters.BaseCharacter):
+            raise TypeError('Player 2 must be a characters.BaseCharacter')
+
+        self.__player1 = player1
+        self.__player2 = player2
+        self.__player1codes = {}
+        self.__player2codes = {}
+
+    @property
+    def player1(self) -> characters.BaseCharacter:
+        return self.__player1
+
+    @property
+    def player2(self) -> characters.BaseCharacter:
+        return self.__player2
+
+    @staticmethod
+    def encode_move(player: characters.BaseCharacter, move: str) -> tuple[int, int]:
+        if type(move) is not str:
+            raise TypeError('Moves must be strings')
+
+        movement, special_attack = player.is_special_attack(move)
+        characters.BaseCharacter.describe_movement(movement)
+
+        # decide_order compares the whole move first and the movement part
+        # second, with ties going to player 1, so both lengths pack into a
+        # single integer that sorts the same way.
+        order = (len(move) << 16) | len(move.split('+')[0])
+        damage = special_attack['damage'] if special_attack else 0
+        return order, damage
+
+    def encode(self, matches: list[tuple[list[str], list[str]]]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        turns = 1
+        for i, (player1moves, player2moves) in enumerate(matches):
+            if not player1moves or not player2moves:
+                raise ValueError(f"Match {i} must have two sets of moves")
+            turns = max(turns, len(player1moves), len(player2moves))
+
+        shape = (len(matches), turns)
+        order1 = np.zeros(shape, dtype=np.int64)
+        order2 = np.zeros(shape, dtype=np.int64)
+        damage1 = np.zeros(shape, dtype=np.int64)
+        damage2 = np.zeros(shape, dtype=np.int64)
+
+        for i, (player1moves, player2moves) in enumerate(matches):
+            for turn, move in enumerate(player1moves):
+                code = self.__player1codes.get(move)
+                if code is None:
+                    code = self.__player1codes[move] = BatchCombat.encode_move(
+                        self.player1, move)
+                order1[i, turn], damage1[i, turn] = code
+            for turn, move in enumerate(player2moves):
+                code = self.__player2codes.get(move)
+                if code is None:
+                    code = self.__player2codes[move] = BatchCombat.encode_move(
+                        self.player2, move)
+                order2[i, turn], damage2[i, turn] = code
+
+        return order1, order2, damage1, damage2
+
+    def resolve(self, encoded: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> dict:
+        order1, order2, damage1, damage2 = encoded
+        matches = damage1.shape[0]
+        health1 = self.player1.health
+        health2 = self.player2.health
+
+        # Nobody can die before the first death, so cumulative damage up to a
+        # turn is exactly what each player has received by then.
+        dealt1 = np.cumsum(damage1, axis=1)
+        dealt2 = np.cumsum(damage2, axis=1)
+        player1first = order1 <= order2
+        deaths = (dealt1 >= health2) | (dealt2 >= health1)
+
+        died = deaths.any(axis=1)
+        deathturn = np.where(died, deaths.argmax(axis=1), -1)
+
+        rows = np.arange(matches)
+        turn = np.maximum(deathturn, 0)
+        first = player1first[rows, turn]
+        dealt1now = dealt1[rows, turn]
+        dealt2now = dealt2[rows, turn]
+        dealt1before = dealt1now - damage1[rows, turn]
+        dealt2before = dealt2now - damage2[rows, turn]
+
+        # On the death turn the player acting first lands the killing blow if
+        # its damage is enough, otherwise the second one does.
+        player1kills = np.where(first, dealt1now >= health2, dealt2now < health1)
+        winner = np.where(died, np.where(player1kills, 1, 2), 0)
+
+        final1 = np.where(
+            died,
+            np.where(player1kills, health1 - np.where(first, dealt2before, dealt2now), 0),
+            health1 - dealt2[:, -1])
+        final2 = np.where(
+            died,
+            np.where(player1kills, 0, health2 - np.where(first, dealt1now, dealt1before)),
+            health2 - dealt1[:, -1])
+
+        return {
+            'winner': winner,
+            'player1_health': final1,
+            'player2_health': final2,
+            'death_turn': deathturn,
+        }
+
+    def fight(self, matches: list[tuple[list[str], list[str]]]) -> dict:
+        return self.resolve(self.encode(matches))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+
+class LRUCache:
+    def __init__(self, max_size: int = 1024, ttl: typing.Union[float, None] = None, clock: typing.Callable[[], float] = time.monotonic) -> None:
+        if type(max_size) is not int:
+            raise TypeError('Max size must be an integer greater than 0')
+        if max_size <= 0:
+            raise ValueError('Max size must be an integer greater than 0')
+        if ttl is not None and type(ttl) not in (int, float):
+            raise TypeError('TTL must be a number greater than 0')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('TTL must be a number greater than 0')
+
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def ttl(self) -> typing.Union[float, None]:
+        return self.__ttl
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self.__clock():
+                del self.__entries[key]
+                self.__expirations += 1
+                self.__misses += 1
+                return default
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return value
+
+    def put(self, key: typing.Hashable, value: typing.Any) -> None:
+        expires_at = None if self.__ttl is None else self.__clock() + self.__ttl
+
+        with self.__lock:
+            self.__entries[key] = (expires_at, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def pop(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {
+                'size': len(self.__entries),
+                'max_size': self.__max_size,
+                'ttl': self.__ttl,
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'evictions': self.__evictions,
+                'expirations': self.__expirations,
+            }
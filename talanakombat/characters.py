@@ -1,11 +1,59 @@
-import random
-import re
-import typing
+from __future__ import annotations
+
+import collections.abc
+import itertools
+import types
 
 from talanakombat import exceptions
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import random
+    import typing
+
+DIRECTIONS = {'W': 'up', 'A': 'left', 'S': 'down', 'D': 'right'}
+VERBS = ('landed a', 'connected a', 'hit a', 'imparted a')
+
+# Movements are at most 5 WASD characters long, so every valid movement is
+# listed here, shortest first, and validating one is a set lookup.
+MOVEMENTS = tuple(
+    ''.join(movement)
+    for length in range(6)
+    for movement in itertools.product(DIRECTIONS, repeat=length)
+)
+VALID_MOVEMENTS = frozenset(MOVEMENTS)
+
+
+def render_movement(movement: str) -> str:
+    if len(movement) == 0:
+        return ' did not move'
+
+    directions = [DIRECTIONS[move] for move in movement]
+    if len(directions) == 1:
+        return f" moved {directions[0]}"
+    return f" moved {', '.join(directions[:-1])} and {directions[-1]}"
+
+
+def movement_descriptions() -> dict[str, str]:
+    # Every valid movement is rendered once, the first time one is narrated,
+    # so combats that are only resolved never pay for it.
+    global MOVEMENT_DESCRIPTIONS
+    try:
+        return MOVEMENT_DESCRIPTIONS
+    except NameError:
+        MOVEMENT_DESCRIPTIONS = {movement: render_movement(movement) for movement in MOVEMENTS}
+        return MOVEMENT_DESCRIPTIONS
+
+
+def __getattr__(name: str):
+    if name == 'MOVEMENT_DESCRIPTIONS':
+        return movement_descriptions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class CharacterTemplate:
+    __slots__ = ('__name', '__health', '__special_attacks', '__special_attacks_matcher', '__special_attacks_key')
 
-class BaseCharacter:
     def __init__(self, name: str, health: int, special_attacks: dict) -> None:
         if type(name) is not str:
             raise TypeError('Name must be a string')
@@ -15,13 +63,15 @@ class BaseCharacter:
             raise TypeError('Health must be an integer greater than 0')
         if health <= 0:
             raise ValueError('Health must be an integer greater than 0')
-        if type(special_attacks) is not dict:
+        # Any mapping is accepted, like the read-only special attacks of
+        # another character, and copied.
+        if not isinstance(special_attacks, collections.abc.Mapping):
             raise TypeError('Special attacks must be a dictionary')
         if len(special_attacks) <= 0:
             raise ValueError('Special attacks must be a non empty dictionary')
 
         for attack in special_attacks.values():
-            if type(attack) is not dict:
+            if not isinstance(attack, collections.abc.Mapping):
                 raise TypeError(
                     'Special attacks elements must be a dictionary')
             if 'name' not in attack:
@@ -38,75 +88,178 @@ class BaseCharacter:
                 raise ValueError(
                     'Special attacks must have a damage greater than 0')
 
+        # Templates are shared by every character built from them, so they
+        # keep read-only copies of the special attacks.
         self.__name = name
         self.__health = health
-        self.__special_attacks = special_attacks
+        self.__special_attacks = types.MappingProxyType({
+            combo: types.MappingProxyType(dict(attack))
+            for combo, attack in special_attacks.items()
+        })
+        self.__special_attacks_matcher = CharacterTemplate.compile_special_attacks(
+            self.__special_attacks)
+        # What a move does only depends on the combos, in order, and their
+        # attacks, so templates that share them can share move tables too.
+        self.__special_attacks_key = tuple(
+            (combo, attack['name'], attack['damage']) for combo, attack in self.__special_attacks.items())
+
+    def __reduce__(self) -> tuple:
+        return CharacterTemplate, (self.name, self.health, self.to_dict()['special_attacks'])
+
+    def __repr__(self) -> str:
+        return f"TalanaKombat.CharacterTemplate(name={self.name!r}, health={self.health}, special_attacks={self.to_dict()['special_attacks']})"
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def health(self) -> int:
+        return self.__health
+
+    @property
+    def special_attacks(self) -> typing.Mapping[str, typing.Mapping]:
+        return self.__special_attacks
+
+    @property
+    def special_attacks_matcher(self) -> dict:
+        return self.__special_attacks_matcher
+
+    @property
+    def special_attacks_key(self) -> tuple:
+        return self.__special_attacks_key
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'health': self.health,
+            'special_attacks': {combo: dict(attack) for combo, attack in self.special_attacks.items()},
+        }
+
+    def replace(self, **kwargs) -> 'CharacterTemplate':
+        return CharacterTemplate(
+            kwargs.get('name', self.name),
+            kwargs.get('health', self.health),
+            kwargs.get('special_attacks', self.to_dict()['special_attacks']))
+
+    @staticmethod
+    def compile_special_attacks(special_attacks: typing.Mapping) -> dict:
+        # Combos are stored in a trie keyed by their characters in reverse
+        # order, so a play is resolved by walking it from its last character.
+        # Each terminal node keeps the combo insertion index, so that when
+        # several combos match the one declared first wins, as it always has.
+        matcher = {}
+        for index, (combo, attack) in enumerate(special_attacks.items()):
+            node = matcher
+            for char in reversed(combo):
+                node = node.setdefault(char, {})
+            node.setdefault('', (index, len(combo), attack))
+        return matcher
+
+
+class BaseCharacter:
+    # A character only holds its current health and the template it was built
+    # from, so creating one for every combat costs a single small object.
+    __slots__ = ('__health', '__template')
+
+    def __init__(self, name: str, health: int, special_attacks: dict) -> None:
+        self.set_template(CharacterTemplate(name, health, special_attacks))
+
+    @classmethod
+    def from_template(cls, template: CharacterTemplate) -> 'BaseCharacter':
+        character = cls.__new__(cls)
+        return character.set_template(template)
 
     def __str__(self) -> str:
         return f"{self.name} has {self.health} health"
 
+    def set_template(self, template: CharacterTemplate) -> 'BaseCharacter':
+        if not isinstance(template, CharacterTemplate):
+            raise TypeError('Template must be a characters.CharacterTemplate')
+        self.__template = template
+        self.__health = template.health
+
+        return self
+
+    @property
+    def template(self) -> CharacterTemplate:
+        return self.__template
+
     @property
     def name(self) -> str:
-        return self.__name
+        return self.__template.name
 
     @property
     def health(self) -> int:
         return self.__health
 
     @property
-    def special_attacks(self) -> dict:
-        try:
-            return self.__special_attacks
-        except AttributeError:
-            return {}
+    def special_attacks(self) -> typing.Mapping[str, typing.Mapping]:
+        return self.__template.special_attacks
 
     def is_alive(self) -> bool:
         return self.health > 0
 
-    def receive_damage(self, amount_of_damage: int) -> None:
+    def apply_damage(self, amount_of_damage: int) -> bool:
         self.__health = max(self.health - amount_of_damage, 0)
-        if self.health == 0:
+        return self.health > 0
+
+    def receive_damage(self, amount_of_damage: int) -> None:
+        if not self.apply_damage(amount_of_damage):
             raise exceptions.DeadPlayerException(f"{self.name} is dead")
 
     def is_special_attack(self, play: str) -> tuple[str, typing.Union[dict, None]]:
-        for attack in self.special_attacks:
-            if attack in play:
-                movement = play[:-len(attack)].replace('+', '')
-                return movement, self.special_attacks[attack]
-        return play.replace('+', ''), None
+        node = self.__template.special_attacks_matcher
+        match = None
+        for char in reversed(play):
+            node = node.get(char)
+            if node is None:
+                break
+            terminal = node.get('')
+            if terminal and (match is None or terminal[0] < match[0]):
+                match = terminal
+        # A combo declared earlier anywhere else in the play still wins, and
+        # cuts the play as if it ended it, as it always has. Only those
+        # combos are looked for, and usually there are none or a few.
+        limit = len(self.special_attacks) if match is None else match[0]
+        for combo, attack in itertools.islice(self.special_attacks.items(), limit):
+            if combo in play:
+                return play[:-len(combo)].replace('+', ''), attack
+        if match is None:
+            return play.replace('+', ''), None
+        return play[:-match[1]].replace('+', ''), match[2]
 
     @staticmethod
-    def describe_movement(movement: str) -> str:
+    def validate_movement(movement: str) -> None:
         if type(movement) is not str:
             raise TypeError('Movements must be a string')
+
+        if movement in VALID_MOVEMENTS or (movement.isascii() and movement.upper() in VALID_MOVEMENTS):
+            return
         if len(movement) > 5:
             raise ValueError('Movements must be 5 or less characters')
-        if re.search('[^WASD]', movement, re.IGNORECASE):
-            raise ValueError('Movements must be only W, A, S or D characters')
-
-        if len(movement) == 0:
-            return ' did not move'
+        raise ValueError('Movements must be only W, A, S or D characters')
 
-        description = ' moved'
-        moves = {'W': 'up', 'A': 'left', 'S': 'down', 'D': 'right'}
-
-        for i, move in enumerate(movement):
-            if len(movement) > 1:
-                if i == len(movement) - 1:
-                    description += ' and'
-                elif i != 0:
-                    description += ','
+    @staticmethod
+    def describe_movement(movement: str) -> str:
+        if type(movement) is not str:
+            raise TypeError('Movements must be a string')
 
-            description += f" {moves[move]}"
+        descriptions = movement_descriptions()
+        description = descriptions.get(movement)
+        if description is None:
+            BaseCharacter.validate_movement(movement)
+            description = descriptions[movement.upper()]
 
         return description
 
-    def describe_special_attack(self, attack: dict) -> str:
-        verbs = ['landed a', 'connected a', 'hit a', 'imparted a']
+    def describe_special_attack(self, attack: dict, rng: random.Random = None) -> str:
+        if rng is None:
+            import random as rng
 
-        return f" {random.choice(verbs)} {attack['name']} attack"
+        return f" {rng.choice(VERBS)} {attack['name']} attack"
 
-    def make_move(self, move: str) -> tuple[str, int]:
+    def make_move(self, move: str, rng: random.Random = None) -> tuple[str, int]:
         assert type(move) is str, 'Move must be a string'
 
         movement, special_attack = self.is_special_attack(move)
@@ -117,42 +270,64 @@ class BaseCharacter:
 
         description += BaseCharacter.describe_movement(movement)
         if special_attack:
-            description += f", and{self.describe_special_attack(special_attack)}"
+            description += f", and{self.describe_special_attack(special_attack, rng)}"
 
         return description, (special_attack['damage'] if special_attack else 0)
 
+    def move_damage(self, move: str) -> int:
+        assert type(move) is str, 'Move must be a string'
+
+        movement, special_attack = self.is_special_attack(move)
+        BaseCharacter.validate_movement(movement)
+
+        return special_attack['damage'] if special_attack else 0
+
 
 class TonynStallone(BaseCharacter):
+    __slots__ = ()
+
+    TEMPLATE = CharacterTemplate('Tonyn Stallone', 6, {
+        'DSD+P': {'name': 'Taladoken', 'damage': 3},
+        'SD+K': {'name': 'Remuyuken', 'damage': 2},
+        'P': {'name': 'Punch', 'damage': 1},
+        'K': {'name': 'Kick', 'damage': 1},
+    })
+
     def __init__(self, **kwargs) -> None:
-        health = kwargs.get('health', 6)
-        special_attacks = kwargs.get('special_attacks', {
-            'DSD+P': {'name': 'Taladoken', 'damage': 3},
-            'SD+K': {'name': 'Remuyuken', 'damage': 2},
-            'P': {'name': 'Punch', 'damage': 1},
-            'K': {'name': 'Kick', 'damage': 1},
-        })
-        super().__init__('Tonyn Stallone', health, special_attacks)
+        template = TonynStallone.TEMPLATE
+        if 'health' in kwargs or 'special_attacks' in kwargs:
+            template = template.replace(
+                health=kwargs.get('health', template.health),
+                special_attacks=kwargs.get('special_attacks', template.to_dict()['special_attacks']))
+        self.set_template(template)
 
     def __repr__(self) -> str:
-        return f"TalanaKombat.TonynStallone(health={self.health}, special_attacks={self.special_attacks})"
+        return f"TalanaKombat.TonynStallone(health={self.health}, special_attacks={self.template.to_dict()['special_attacks']})"
 
     def __str__(self) -> str:
         return super().__str__()
 
 
 class ArnaldorShuatseneguer(BaseCharacter):
+    __slots__ = ()
+
+    TEMPLATE = CharacterTemplate('Arnaldor Shuatseneguer', 6, {
+        'ASA+P': {'name': 'Taladoken', 'damage': 2},
+        'SA+K': {'name': 'Remuyuken', 'damage': 3},
+        'P': {'name': 'Punch', 'damage': 1},
+        'K': {'name': 'Kick', 'damage': 1},
+    })
+
     def __init__(self, **kwargs) -> None:
-        health = kwargs.get('health', 6)
-        special_attacks = kwargs.get('special_attacks', {
-            'ASA+P': {'name': 'Taladoken', 'damage': 2},
-            'SA+K': {'name': 'Remuyuken', 'damage': 3},
-            'P': {'name': 'Punch', 'damage': 1},
-            'K': {'name': 'Kick', 'damage': 1},
-        })
-        super().__init__('Arnaldor Shuatseneguer', health, special_attacks)
+        template = ArnaldorShuatseneguer.TEMPLATE
+        if 'health' in kwargs or 'special_attacks' in kwargs:
+            template = template.replace(
+                health=kwargs.get('health', template.health),
+                special_attacks=kwargs.get('special_attacks', template.to_dict()['special_attacks']))
+        self.set_template(template)
 
     def __repr__(self) -> str:
-        return f"TalanaKombat.ArnaldorShuatseneguer(health={self.health}, special_attacks={self.special_attacks})"
+        return f"TalanaKombat.ArnaldorShuatseneguer(health={self.health}, special_attacks={self.template.to_dict()['special_attacks']})"
 
     def __str__(self) -> str:
         return super().__str__()
@@ -1,11 +1,40 @@
-import typing
+from __future__ import annotations
+
+import itertools
 
 from talanakombat import characters
-from talanakombat import exceptions
+from talanakombat import events
+from talanakombat import matchup
+from talanakombat import metrics
+from talanakombat import stats
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import random
+    import typing
+
+VERB_INDEXES = range(len(characters.VERBS))
+
+
+def is_move_iterable(moves: typing.Any) -> bool:
+    # A string is iterable too, but as a list of one letter moves it's almost
+    # certainly a mistake.
+    if isinstance(moves, (str, bytes)):
+        return False
+    try:
+        iter(moves)
+    except TypeError:
+        return False
+    return True
 
 
 class Combat:
     def __init__(self, **kwargs) -> None:
+        self.__seed = kwargs.get('seed', None)
+        self.__rng = None
+        self.__opening = []
+        self.__special_attacks = {}
+        self.__stats_record = None
         player1 = kwargs.get('player1', None)
         player2 = kwargs.get('player2', None)
         if player1 and player2:
@@ -30,14 +59,33 @@ class Combat:
             return None
 
     @property
-    def player1moves(self) -> typing.Union[str, None]:
+    def seed(self) -> typing.Union[int, str, None]:
+        return self.__seed
+
+    @property
+    def stats_record(self) -> typing.Union[stats.Record, None]:
+        # What the combat added to the stats, once it's over.
+        return self.__stats_record
+
+    @property
+    def rng(self) -> random.Random:
+        # Only narration draws random numbers, so the generator (and the
+        # random module) are only loaded when a combat is narrated. Unseeded
+        # combats share the module's generator instead of seeding their own.
+        if self.__rng is None:
+            import random
+            self.__rng = random if self.__seed is None else random.Random(self.__seed)
+        return self.__rng
+
+    @property
+    def player1moves(self) -> typing.Union[typing.Iterable[str], None]:
         try:
             return self.__player1moves
         except AttributeError:
             return None
 
     @property
-    def player2moves(self) -> typing.Union[str, None]:
+    def player2moves(self) -> typing.Union[typing.Iterable[str], None]:
         try:
             return self.__player2moves
         except AttributeError:
@@ -53,66 +101,217 @@ class Combat:
 
         return self
 
-    def set_moves(self, player1moves: list[str], player2moves: list[str]) -> 'Combat':
-        if not type(player1moves) is list:
-            raise TypeError('Player 1 moves must be a list of strings')
-        if not type(player2moves) is list:
-            raise TypeError('Player 2 moves must be a list of strings')
+    def set_moves(self, player1moves: typing.Iterable[str], player2moves: typing.Iterable[str]) -> 'Combat':
+        if not is_move_iterable(player1moves):
+            raise TypeError('Player 1 moves must be a list or an iterable of strings')
+        if not is_move_iterable(player2moves):
+            raise TypeError('Player 2 moves must be a list or an iterable of strings')
 
+        # Lists are padded to the same length, on copies so the caller's
+        # lists are never changed. Any other iterable is only read while the
+        # combat is played, one turn at a time, and padded as it runs out.
+        self.__streaming = type(player1moves) is not list or type(player2moves) is not list
+        if not self.__streaming:
+            diff = len(player1moves) - len(player2moves)
+            if diff > 0:
+                player2moves = player2moves + [''] * diff
+            elif diff < 0:
+                player1moves = player1moves + [''] * -diff
         self.__player1moves = player1moves
         self.__player2moves = player2moves
-        diff = len(player1moves) - len(player2moves)
-        if diff > 0:
-            self.__player2moves += [''] * diff
-        elif diff < 0:
-            self.__player1moves += [''] * -diff
 
         return self
 
+    def moves(self) -> typing.Iterator[tuple[str, str]]:
+        if not self.__streaming:
+            return zip(self.player1moves, self.player2moves)
+
+        pairs = itertools.zip_longest(self.player1moves, self.player2moves, fillvalue='')
+        if metrics.enabled or stats.enabled:
+            # Streamed moves can't be read again once the combat is over, so
+            # their special attacks are found as they are played.
+            self.__special_attacks = {}
+            pairs = metrics.count_special_attacks(self, pairs, metrics.collector(self.__special_attacks))
+        if stats.enabled:
+            self.__opening = []
+            pairs = stats.watch_moves(pairs, self.__opening)
+        return pairs
+
     def decide_order(self, player1move: str, player2move: str) -> tuple[characters.BaseCharacter, characters.BaseCharacter, str, str]:
-        try:
-            if len(player1move) < len(player2move):
-                return self.player1, self.player2, player1move, player2move
-            elif len(player1move) > len(player2move):
-                return self.player2, self.player1, player2move, player1move
-            elif len(player1move.split('+')[0]) < len(player2move.split('+')[0]):
-                return self.player1, self.player2, player1move, player2move
-            elif len(player1move.split('+')[0]) > len(player2move.split('+')[0]):
-                return self.player2, self.player1, player2move, player1move
-            elif len(player1move.split('+')[1]) < len(player2move.split('+')[1]):
-                return self.player1, self.player2, player1move, player2move
-            elif len(player1move.split('+')[1]) > len(player2move.split('+')[1]):
-                return self.player2, self.player1, player2move, player1move
-            else:
-                return self.player1, self.player2, player1move, player2move
-        except IndexError:
+        if matchup.player1_first(player1move, player2move):
             return self.player1, self.player2, player1move, player2move
+        return self.player2, self.player1, player2move, player1move
 
-    def fight(self) -> None:
-        if not self.player1 or not self.player2:
-            raise AttributeError('Combat must have two players')
+    def check_ready(self) -> None:
+        self.check_players()
         if not self.player1moves or not self.player2moves:
             raise AttributeError('Combat must have two sets of moves')
 
-        for p1, p2 in zip(self.player1moves, self.player2moves):
-            first, second, p1, p2 = self.decide_order(p1, p2)
-            try:
-                description, damage = first.make_move(p1)
-                yield description
-                second.receive_damage(damage)
-            except exceptions.DeadPlayerException:
-                yield f"{second.name} is dead"
-                break
+    def resolve(self) -> dict:
+        self.check_ready()
+
+        player1 = self.player1
+        player2 = self.player2
+        pairing = matchup.get(player1.template, player2.template)
+        turns = pairing.turns
+        refresh = turns.move_to_end
+        death_turn = None
+        turn = -1
+        for turn, moves in enumerate(self.moves()):
+            p1, p2 = moves
             try:
-                description, damage = second.make_move(p2)
-                yield description
-                first.receive_damage(damage)
-            except exceptions.DeadPlayerException:
-                yield f"{first.name} is dead"
+                entry = turns[moves]
+                refresh(moves)
+            except KeyError:
+                entry = pairing.compute(p1, p2)
+            except TypeError:
+                entry = None
+            if entry is None:
+                first, second, first_move, second_move = self.decide_order(p1, p2)
+                if not second.apply_damage(first.move_damage(first_move)):
+                    death_turn = turn
+                    break
+                if not first.apply_damage(second.move_damage(second_move)):
+                    death_turn = turn
+                    break
+                continue
+
+            player1_moves_first, info1, info2 = entry
+            if player1_moves_first:
+                if not player2.apply_damage(info1[0]) or not player1.apply_damage(info2[0]):
+                    death_turn = turn
+                    break
+            elif not player1.apply_damage(info2[0]) or not player2.apply_damage(info1[0]):
+                death_turn = turn
                 break
+
+        if metrics.enabled or stats.enabled:
+            self.record_metrics(turn + 1, death_turn, (p1, p2) if death_turn is not None else None)
+
+        winner = None
         if self.player1.is_alive() and not self.player2.is_alive():
-            yield f"{self.player1.name} is the winner and has {self.player1.health} health"
+            winner = self.player1
         elif self.player2.is_alive() and not self.player1.is_alive():
-            yield f"{self.player2.name} is the winner and has {self.player2.health} health"
+            winner = self.player2
+
+        return {
+            'winner': winner,
+            'player1_health': self.player1.health,
+            'player2_health': self.player2.health,
+            'death_turn': death_turn,
+        }
+
+    def record_metrics(self, turns: int, death_turn: typing.Union[int, None], death_moves: typing.Union[tuple[str, str], None]) -> None:
+        # The special attacks are found once, in a single pass, and shared by
+        # the metrics and the stats.
+        if self.__streaming:
+            special_attacks = self.__special_attacks
+            if death_moves is not None:
+                metrics.record_death_turn(self, *death_moves, metrics.collector(special_attacks))
+            opening = self.__opening
         else:
-            yield 'Combat ended in a draw'
+            special_attacks = metrics.special_attacks_played(self, turns, death_turn)
+            opening = None
+
+        # The record is kept even when only the metrics are enabled, so a
+        # combat played in another process can be counted by this one.
+        self.__stats_record = stats.make_record(self, turns, special_attacks, opening)
+        if metrics.enabled:
+            metrics.record_combat(self, turns, death_turn, special_attacks)
+        if stats.enabled:
+            stats.STATS.add(self.__stats_record)
+
+    def check_players(self) -> None:
+        if not self.player1 or not self.player2:
+            raise AttributeError('Combat must have two players')
+
+    def move_event(self, attacker: characters.BaseCharacter, defender: characters.BaseCharacter, move: str) -> events.Move:
+        return self.info_event(attacker, defender, matchup.move_info(attacker, move))
+
+    def info_event(self, attacker: characters.BaseCharacter, defender: characters.BaseCharacter, info: matchup.MoveInfo) -> events.Move:
+        damage, movement, attack = info
+        if attack is None:
+            return events.Move(attacker.name, defender.name, movement, None, None, 0, defender.health)
+
+        # Only the verb is drawn here, from the same random stream the
+        # narration always used, so the text can be rendered later and still
+        # match the seed.
+        defender.apply_damage(damage)
+        return events.Move(attacker.name, defender.name, movement, attack,
+                           self.rng.choice(VERB_INDEXES), damage, defender.health)
+
+    def turn_events(self, player1move: str, player2move: str) -> typing.Iterator[events.Event]:
+        first, second, p1, p2 = self.decide_order(player1move, player2move)
+        for attacker, defender, move in ((first, second, p1), (second, first, p2)):
+            yield self.move_event(attacker, defender, move)
+            if not defender.is_alive():
+                yield events.Death(defender.name)
+                return
+
+    def play_turn(self, player1move: str, player2move: str, locale: str = 'en') -> typing.Generator[str, None, bool]:
+        render = events.renderer(locale)
+        for event in self.turn_events(player1move, player2move):
+            yield render(event)
+        return self.player1.is_alive() and self.player2.is_alive()
+
+    def outcome_event(self) -> events.Outcome:
+        if self.player1.is_alive() and not self.player2.is_alive():
+            return events.Outcome(self.player1.name, self.player1.health)
+        elif self.player2.is_alive() and not self.player1.is_alive():
+            return events.Outcome(self.player2.name, self.player2.health)
+        else:
+            return events.Outcome(None, None)
+
+    def describe_outcome(self, locale: str = 'en') -> str:
+        return events.render(self.outcome_event(), locale)
+
+    def fight_events(self) -> typing.Iterator[events.Event]:
+        self.check_ready()
+
+        player1 = self.player1
+        player2 = self.player2
+        pairing = matchup.get(player1.template, player2.template)
+        turns = pairing.turns
+        refresh = turns.move_to_end
+        info_event = self.info_event
+        death_turn = None
+        turn = -1
+        for turn, moves in enumerate(self.moves()):
+            p1, p2 = moves
+            try:
+                entry = turns[moves]
+                refresh(moves)
+            except KeyError:
+                entry = pairing.compute(p1, p2)
+            except TypeError:
+                entry = None
+            if entry is None:
+                yield from self.turn_events(p1, p2)
+                if not (player1.is_alive() and player2.is_alive()):
+                    death_turn = turn
+                    break
+                continue
+
+            player1_moves_first, info1, info2 = entry
+            if player1_moves_first:
+                first, second, first_info, second_info = player1, player2, info1, info2
+            else:
+                first, second, first_info, second_info = player2, player1, info2, info1
+            yield info_event(first, second, first_info)
+            if not second.is_alive():
+                yield events.Death(second.name)
+                death_turn = turn
+                break
+            yield info_event(second, first, second_info)
+            if not first.is_alive():
+                yield events.Death(first.name)
+                death_turn = turn
+                break
+        if metrics.enabled or stats.enabled:
+            self.record_metrics(turn + 1, death_turn, (p1, p2) if death_turn is not None else None)
+        yield self.outcome_event()
+
+    def fight(self, locale: str = 'en') -> typing.Iterator[str]:
+        render = events.renderer(locale)
+        for event in self.fight_events():
+            yield render(event)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import copy
+import functools
+import itertools
+import math
+import os
+import statistics
+
+import numpy as np
+
+from talanakombat import characters
+from talanakombat import validation
+from talanakombat.batch import BatchCombat
+from talanakombat.combat import Combat
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+# Completions are simulated in batches of at most this many turns in total,
+# so a long match gets fewer completions per batch instead of huge arrays.
+MAX_BATCH_CELLS = 1 << 20
+
+# Pool workers receive the players and move distributions once, through the
+# initializer. Tasks only carry a batch size and a seed.
+worker_state = None
+
+
+def move_set(player: characters.BaseCharacter) -> list[str]:
+    # Every movement, alone or followed by one of the buttons that end the
+    # character's combos, keeping only the moves the combat accepts.
+    buttons = sorted({combo.rsplit('+', 1)[-1] for combo in player.special_attacks})
+    check = validation.get(player.template).check
+    moves = []
+    for movement, button in itertools.product(characters.MOVEMENTS, [''] + buttons):
+        move = f"{movement}+{button}" if movement and button else movement or button
+        if check(move) is None:
+            moves.append(move)
+    return moves
+
+
+def encode_distribution(player: characters.BaseCharacter, distribution: typing.Mapping[str, float]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if not distribution:
+        raise ValueError(f"{player.name} move distribution must be a non empty dictionary")
+
+    orders = []
+    damages = []
+    weights = []
+    for move, weight in distribution.items():
+        if type(weight) not in (int, float) or weight < 0:
+            raise ValueError('Move frequencies must be numbers greater or equal than 0')
+        order, damage = BatchCombat.encode_move(player, move)
+        orders.append(order)
+        damages.append(damage)
+        weights.append(weight)
+
+    total = sum(weights)
+    if total <= 0:
+        raise ValueError(f"{player.name} move distribution must have a frequency greater than 0")
+    return (np.array(orders, dtype=np.int64), np.array(damages, dtype=np.int64),
+            np.array(weights, dtype=np.float64) / total)
+
+
+def with_health(template: characters.CharacterTemplate, health: int) -> characters.BaseCharacter:
+    player = characters.BaseCharacter.from_template(template)
+    player.apply_damage(template.health - health)
+    return player
+
+
+def init_worker(player1: tuple[characters.CharacterTemplate, int], player2: tuple[characters.CharacterTemplate, int], codes1: tuple, codes2: tuple, remaining: int) -> None:
+    global worker_state
+    worker_state = (with_health(*player1), with_health(*player2), codes1, codes2, remaining)
+
+
+def simulate(task: tuple[int, np.random.SeedSequence]) -> tuple[int, int, int]:
+    size, seed = task
+    player1, player2, codes1, codes2, remaining = worker_state
+    rng = np.random.default_rng(seed)
+
+    encoded = []
+    for orders, damages, probabilities in (codes1, codes2):
+        picks = rng.choice(len(probabilities), size=(size, remaining), p=probabilities)
+        encoded.append((orders[picks], damages[picks]))
+    (order1, damage1), (order2, damage2) = encoded
+
+    winner = BatchCombat(player1=player1, player2=player2).resolve(
+        (order1, order2, damage1, damage2))['winner']
+    draws, wins1, wins2 = np.bincount(winner, minlength=3).tolist()
+    return wins1, wins2, draws
+
+
+def wilson_interval(successes: int, samples: int, z: float) -> tuple[float, float]:
+    if samples == 0:
+        return 0.0, 1.0
+    p = successes / samples
+    denominator = 1 + z * z / samples
+    center = (p + z * z / (2 * samples)) / denominator
+    half = z * math.sqrt(p * (1 - p) / samples + z * z / (4 * samples * samples)) / denominator
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+class Estimator:
+    # Plays the turns already known and then completes the match many times
+    # with random moves, resolved in vectorized batches by BatchCombat.
+    def __init__(self, **kwargs) -> None:
+        player1 = kwargs.get('player1', None) or characters.TonynStallone()
+        player2 = kwargs.get('player2', None) or characters.ArnaldorShuatseneguer()
+        if not isinstance(player1, characters.BaseCharacter):
+            raise TypeError('Player 1 must be a characters.BaseCharacter')
+        if not isinstance(player2, characters.BaseCharacter):
+            raise TypeError('Player 2 must be a characters.BaseCharacter')
+
+        confidence = kwargs.get('confidence', 0.95)
+        if not 0 < confidence < 1:
+            raise ValueError('Confidence must be a number between 0 and 1')
+
+        # Without a distribution, every legal move of the character is
+        # equally likely.
+        distributions = []
+        for player, key in ((player1, 'player1distribution'), (player2, 'player2distribution')):
+            distribution = kwargs.get(key, None)
+            if distribution is None:
+                distribution = dict.fromkeys(move_set(player), 1)
+            distributions.append(encode_distribution(player, distribution))
+
+        self.__player1 = player1
+        self.__player2 = player2
+        self.__codes1, self.__codes2 = distributions
+        self.__z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+        self.__tolerance = kwargs.get('tolerance', 0.01)
+        self.__batch_size = kwargs.get('batch_size', 10000)
+        self.__max_samples = kwargs.get('max_samples', 1000000)
+        self.__workers = kwargs.get('workers', os.cpu_count() or 1)
+        self.__seed = kwargs.get('seed', None)
+
+    @property
+    def player1(self) -> characters.BaseCharacter:
+        return self.__player1
+
+    @property
+    def player2(self) -> characters.BaseCharacter:
+        return self.__player2
+
+    def play_known_turns(self, player1moves: list[str], player2moves: list[str]) -> tuple[characters.BaseCharacter, characters.BaseCharacter, dict]:
+        player1 = copy.copy(self.__player1)
+        player2 = copy.copy(self.__player2)
+        if not player1moves and not player2moves:
+            return player1, player2, {'death_turn': None}
+
+        validation.check(player1, player2, player1moves, player2moves)
+        outcome = Combat(player1=player1, player2=player2,
+                         player1moves=list(player1moves) or [''],
+                         player2moves=list(player2moves) or ['']).resolve()
+        return player1, player2, outcome
+
+    def result(self, player1: characters.BaseCharacter, player2: characters.BaseCharacter, counts: list[int], **kwargs) -> dict:
+        samples = sum(counts)
+        probabilities = [count / samples for count in counts]
+        if kwargs.get('exact', False):
+            intervals = [(probability, probability) for probability in probabilities]
+            samples = 0
+        else:
+            intervals = [wilson_interval(count, samples, self.__z) for count in counts]
+
+        return {
+            'samples': samples,
+            'turns': kwargs['turns'],
+            'remaining': kwargs['remaining'],
+            'player1_health': player1.health,
+            'player2_health': player2.health,
+            'player1_win': probabilities[0],
+            'player2_win': probabilities[1],
+            'draw': probabilities[2],
+            'intervals': {
+                'player1_win': intervals[0],
+                'player2_win': intervals[1],
+                'draw': intervals[2],
+            },
+            'converged': kwargs['converged'],
+        }
+
+    def estimate(self, player1moves: list[str], player2moves: list[str], turns: int) -> dict:
+        known = max(len(player1moves), len(player2moves))
+        if type(turns) is not int or turns < known:
+            raise ValueError('Turns must be an integer not smaller than the number of moves played')
+
+        player1, player2, outcome = self.play_known_turns(player1moves, player2moves)
+        remaining = turns - known
+
+        # A decided match (or one with nothing left to play) has a single
+        # outcome, with no uncertainty to estimate.
+        if outcome['death_turn'] is not None or remaining == 0:
+            counts = [int(player1.is_alive() and not player2.is_alive()),
+                      int(player2.is_alive() and not player1.is_alive()),
+                      int(player1.is_alive() == player2.is_alive())]
+            return self.result(player1, player2, counts, turns=known, remaining=remaining, converged=True, exact=True)
+
+        size = max(1, min(self.__batch_size, MAX_BATCH_CELLS // remaining))
+        state = (
+            (player1.template, player1.health),
+            (player2.template, player2.health),
+            self.__codes1, self.__codes2, remaining,
+        )
+        seeds = np.random.SeedSequence(self.__seed)
+        counts = [0, 0, 0]
+        converged = False
+
+        if self.__workers <= 1:
+            init_worker(*state)
+            executor = None
+            run = functools.partial(map, simulate)
+        else:
+            # The pool is only loaded when it's used, like in the replay CLI.
+            import concurrent.futures
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.__workers, initializer=init_worker, initargs=state)
+            run = functools.partial(executor.map, simulate)
+
+        # Each round runs one batch per worker, then the intervals are
+        # checked, so the estimate stops as soon as they are narrow enough.
+        try:
+            while not converged and sum(counts) < self.__max_samples:
+                sizes = []
+                left = self.__max_samples - sum(counts)
+                while left > 0 and len(sizes) < max(1, self.__workers):
+                    sizes.append(min(size, left))
+                    left -= sizes[-1]
+                for result in run(zip(sizes, seeds.spawn(len(sizes)))):
+                    counts = [total + count for total, count in zip(counts, result)]
+
+                samples = sum(counts)
+                converged = all(high - low <= 2 * self.__tolerance
+                                for low, high in (wilson_interval(count, samples, self.__z) for count in counts))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return self.result(player1, player2, counts, turns=known, remaining=remaining, converged=converged)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import collections
+
+from talanakombat import characters
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+LOCALES = {
+    'en': {
+        'directions': characters.DIRECTIONS,
+        'verbs': characters.VERBS,
+        'still': ' did not move',
+        'moved': ' moved {}',
+        'and': ' and ',
+        'nothing': '{} did nothing',
+        'attack': ', and {} {} attack',
+        'dead': '{} is dead',
+        'winner': '{} is the winner and has {} health',
+        'draw': 'Combat ended in a draw',
+    },
+    'es': {
+        'directions': {'W': 'arriba', 'A': 'a la izquierda', 'S': 'abajo', 'D': 'a la derecha'},
+        'verbs': ('acertó un', 'conectó un', 'lanzó un', 'propinó un'),
+        'still': ' no se movió',
+        'moved': ' se movió {}',
+        'and': ' y ',
+        'nothing': '{} no hizo nada',
+        'attack': ', y {} ataque {}',
+        'dead': '{} ha muerto',
+        'winner': '{} es el ganador y tiene {} de vida',
+        'draw': 'El combate terminó en empate',
+    },
+}
+
+# Movement tables are rendered the first time a locale is used. English
+# shares the one of the characters module.
+movement_tables = {}
+renderers = {}
+
+
+# Moves keep the movement in upper case, so it is always a key of the
+# movement tables. attack and verb are None when the move isn't a special
+# attack, and health is the target's health after the move.
+Move = collections.namedtuple('Move', ('actor', 'target', 'movement', 'attack', 'verb', 'damage', 'health'))
+Death = collections.namedtuple('Death', ('actor',))
+# winner and health are None on a draw.
+Outcome = collections.namedtuple('Outcome', ('winner', 'health'))
+
+if TYPE_CHECKING:
+    Event = typing.Union[Move, Death, Outcome]
+
+
+def get_locale(locale: str) -> dict:
+    templates = LOCALES.get(locale)
+    if templates is None:
+        raise ValueError(f"Locale must be one of {', '.join(LOCALES)}")
+    return templates
+
+
+def render_movement(movement: str, locale: str = 'en') -> str:
+    templates = get_locale(locale)
+    if len(movement) == 0:
+        return templates['still']
+
+    directions = [templates['directions'][move] for move in movement]
+    if len(directions) == 1:
+        return templates['moved'].format(directions[0])
+    return templates['moved'].format(', '.join(directions[:-1]) + templates['and'] + directions[-1])
+
+
+def movement_table(locale: str) -> dict[str, str]:
+    table = movement_tables.get(locale)
+    if table is None:
+        if locale == 'en':
+            table = characters.movement_descriptions()
+        else:
+            table = {movement: render_movement(movement, locale) for movement in characters.MOVEMENTS}
+        movement_tables[locale] = table
+    return table
+
+
+def renderer(locale: str = 'en') -> typing.Callable[[Event], str]:
+    # Renderers are built once per locale with their templates bound, since
+    # long combats render one event per move.
+    render = renderers.get(locale)
+    if render is not None:
+        return render
+
+    templates = get_locale(locale)
+    movements = movement_table(locale)
+    verbs = templates['verbs']
+    nothing = templates['nothing']
+    attack = templates['attack']
+
+    def render(event: Event) -> str:
+        kind = type(event)
+        if kind is Move:
+            if event.attack is None:
+                if not event.movement:
+                    return nothing.format(event.actor)
+                return event.actor + movements[event.movement]
+            return event.actor + movements[event.movement] + attack.format(verbs[event.verb], event.attack)
+        if kind is Death:
+            return templates['dead'].format(event.actor)
+        if kind is Outcome:
+            if event.winner is None:
+                return templates['draw']
+            return templates['winner'].format(event.winner, event.health)
+        raise TypeError('Event must be a Move, Death or Outcome')
+
+    renderers[locale] = render
+    return render
+
+
+def render(event: Event, locale: str = 'en') -> str:
+    return renderer(locale)(event)
+
+
+def to_dict(event: Event) -> dict:
+    return {'event': type(event).__name__.lower(), **event._asdict()}
@@ -1,2 +1,16 @@
 class DeadPlayerException(Exception):
     pass
+
+
+class SearchBudgetException(Exception):
+    pass
+
+
+class InvalidMovesException(ValueError):
+    def __init__(self, message: str, errors: list[dict]) -> None:
+        super().__init__(message)
+        self.errors = errors
+
+    def __reduce__(self) -> tuple:
+        # Raised in worker processes too, so it must survive being pickled.
+        return InvalidMovesException, (str(self), self.errors)
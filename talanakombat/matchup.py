@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import collections
+
+from talanakombat import cache
+from talanakombat import characters
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+    MoveInfo = tuple[int, str, typing.Union[str, None]]
+    Turn = tuple[bool, MoveInfo, MoveInfo]
+
+
+def player1_first(player1move: str, player2move: str) -> bool:
+    # The shorter move goes first, then the one with the shorter movement,
+    # then the one with the shorter attack. Player 1 wins every tie, and the
+    # attacks are only compared when both moves have one.
+    if len(player1move) != len(player2move):
+        return len(player1move) < len(player2move)
+    parts1 = player1move.split('+')
+    parts2 = player2move.split('+')
+    if len(parts1[0]) != len(parts2[0]):
+        return len(parts1[0]) < len(parts2[0])
+    if len(parts1) == 1 or len(parts2) == 1:
+        return True
+    return len(parts1[1]) <= len(parts2[1])
+
+
+def move_info(player: characters.BaseCharacter, move: str) -> MoveInfo:
+    assert type(move) is str, 'Move must be a string'
+
+    movement, special_attack = player.is_special_attack(move)
+    if movement not in characters.VALID_MOVEMENTS:
+        characters.BaseCharacter.validate_movement(movement)
+        movement = movement.upper()
+
+    if special_attack is None:
+        return 0, movement, None
+    return special_attack['damage'], movement, special_attack['name']
+
+
+class Matchup:
+    # Who acts first and what each move does only depend on the two moves and
+    # the characters' special attacks, so each pair of moves is resolved once
+    # and every later turn with the same pair is a single dictionary lookup.
+    # Once full, the least recently used pair makes room for the new one.
+    def __init__(self, template1: characters.CharacterTemplate, template2: characters.CharacterTemplate, max_size: int = 4096) -> None:
+        self.__player1 = characters.BaseCharacter.from_template(template1)
+        self.__player2 = characters.BaseCharacter.from_template(template2)
+        self.__max_size = max_size
+        self.__turns = collections.OrderedDict()
+
+    @property
+    def turns(self) -> collections.OrderedDict[tuple[str, str], Turn]:
+        return self.__turns
+
+    def __len__(self) -> int:
+        return len(self.__turns)
+
+    def compute(self, player1move: str, player2move: str) -> typing.Union[Turn, None]:
+        # Pairs with an invalid move aren't stored, so the combat can play
+        # them the slow way and fail exactly where it always did.
+        try:
+            turn = (
+                player1_first(player1move, player2move),
+                move_info(self.__player1, player1move),
+                move_info(self.__player2, player2move),
+            )
+        except (AssertionError, AttributeError, TypeError, ValueError):
+            return None
+
+        if len(self.__turns) >= self.__max_size:
+            self.__turns.popitem(last=False)
+        self.__turns[(player1move, player2move)] = turn
+        return turn
+
+    def turn(self, player1move: str, player2move: str) -> typing.Union[Turn, None]:
+        key = (player1move, player2move)
+        try:
+            turn = self.__turns.get(key)
+        except TypeError:
+            return None
+        if turn is None:
+            return self.compute(player1move, player2move)
+        self.__turns.move_to_end(key)
+        return turn
+
+
+# Tables are found by template pair first, which only hashes two identities.
+# Templates new to the cache share the table of any pair with the same
+# special attacks, whatever their names and health, so a character built
+# with a custom health reuses the table of its original template.
+matchups = cache.LRUCache(max_size=64)
+tables = cache.LRUCache(max_size=64)
+
+
+def get(template1: characters.CharacterTemplate, template2: characters.CharacterTemplate) -> Matchup:
+    key = (template1, template2)
+    matchup = matchups.get(key)
+    if matchup is None:
+        shared_key = (template1.special_attacks_key, template2.special_attacks_key)
+        matchup = tables.get(shared_key)
+        if matchup is None:
+            matchup = Matchup(template1, template2)
+            tables.put(shared_key, matchup)
+        matchups.put(key, matchup)
+    return matchup
+
+
+def clear() -> None:
+    matchups.clear()
+    tables.clear()
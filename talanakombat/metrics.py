@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+enabled = False
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def escape(value: typing.Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels: tuple[tuple[str, typing.Any], ...]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f"{name}=\"{escape(value)}\"" for name, value in labels) + '}'
+
+
+class Counter:
+    def __init__(self, name: str, description: str) -> None:
+        self.__name = name
+        self.__description = description
+        self.__values = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def inc(self, amount: int = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.__lock:
+            self.__values[key] = self.__values.get(key, 0) + amount
+
+    def value(self, **labels) -> int:
+        return self.__values.get(tuple(sorted(labels.items())), 0)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__values.clear()
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.__description}",
+                 f"# TYPE {self.name} counter"]
+        with self.__lock:
+            values = dict(self.__values) or {(): 0}
+        for labels, value in values.items():
+            lines.append(f"{self.name}{format_labels(labels)} {value}")
+        return '\n'.join(lines)
+
+
+class Timer:
+    def __init__(self, histogram: 'Histogram') -> None:
+        self.__histogram = histogram
+        self.__start = None
+
+    def __enter__(self) -> 'Timer':
+        if enabled:
+            self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.__start is not None:
+            self.__histogram.observe(time.perf_counter() - self.__start)
+
+
+class Histogram:
+    BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+               0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, description: str, buckets: typing.Sequence[float] = BUCKETS) -> None:
+        self.__name = name
+        self.__description = description
+        self.__buckets = tuple(sorted(buckets))
+        self.__counts = [0] * (len(self.__buckets) + 1)
+        self.__sum = 0.0
+        self.__lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def count(self) -> int:
+        return sum(self.__counts)
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.__buckets, value)
+        with self.__lock:
+            self.__counts[index] += 1
+            self.__sum += value
+
+    def time(self) -> Timer:
+        return Timer(self)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__counts = [0] * (len(self.__buckets) + 1)
+            self.__sum = 0.0
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.__description}",
+                 f"# TYPE {self.name} histogram"]
+        with self.__lock:
+            counts = list(self.__counts)
+            total = self.__sum
+        cumulative = 0
+        for bound, count in zip(self.__buckets, counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{{le=\"{bound}\"}} {cumulative}")
+        cumulative += counts[-1]
+        lines.append(f"{self.name}_bucket{{le=\"+Inf\"}} {cumulative}")
+        lines.append(f"{self.name}_sum {total}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return '\n'.join(lines)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.__metrics = {}
+
+    def register(self, metric: typing.Union[Counter, Histogram]) -> typing.Union[Counter, Histogram]:
+        if metric.name in self.__metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.__metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self.register(Counter(name, description))
+
+    def histogram(self, name: str, description: str, buckets: typing.Sequence[float] = Histogram.BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, buckets))
+
+    def clear(self) -> None:
+        for metric in self.__metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self.__metrics.values()) + '\n'
+
+
+REGISTRY = Registry()
+
+TURNS = REGISTRY.counter(
+    'talanakombat_turns_total', 'Turns simulated')
+DEATHS = REGISTRY.counter(
+    'talanakombat_deaths_total', 'Combats that ended with a dead player')
+DRAWS = REGISTRY.counter(
+    'talanakombat_draws_total', 'Combats that ended in a draw')
+SPECIAL_ATTACKS = REGISTRY.counter(
+    'talanakombat_special_attacks_total', 'Special attacks performed, by character and attack')
+
+
+def find_special_attack(player, move: str) -> typing.Union[tuple[str, str], None]:
+    special_attack = player.is_special_attack(move)[1]
+    if special_attack:
+        return player.name, special_attack['name']
+    return None
+
+
+def record_special_attack(player, move: str) -> None:
+    special_attack = find_special_attack(player, move)
+    if special_attack is not None:
+        SPECIAL_ATTACKS.inc(character=special_attack[0], attack=special_attack[1])
+
+
+def record_special_attacks(counts: typing.Mapping[tuple[str, str], int]) -> None:
+    for (character, attack), count in counts.items():
+        SPECIAL_ATTACKS.inc(count, character=character, attack=attack)
+
+
+def collector(counts: dict) -> typing.Callable:
+    # A record callback that counts the special attacks by character and
+    # attack, so they are found once and then shared by the metrics and the
+    # stats, in memory bounded by the roster however long the combat is.
+    def record(player, move: str) -> None:
+        special_attack = find_special_attack(player, move)
+        if special_attack is not None:
+            counts[special_attack] = counts.get(special_attack, 0) + 1
+    return record
+
+
+def record_outcome(turns: int, death_turn: typing.Union[int, None]) -> None:
+    TURNS.inc(turns)
+    if death_turn is None:
+        DRAWS.inc()
+    else:
+        DEATHS.inc()
+
+
+def record_death_turn(combat, player1move: str, player2move: str, record: typing.Callable = record_special_attack) -> None:
+    # On the last turn the second player only acts if the first one didn't
+    # kill it.
+    first, second, p1, p2 = combat.decide_order(player1move, player2move)
+    record(first, p1)
+    if second.is_alive():
+        record(second, p2)
+
+
+def count_special_attacks(combat, moves: typing.Iterable[tuple[str, str]], record: typing.Callable = record_special_attack) -> typing.Iterator[tuple[str, str]]:
+    # A turn is counted when the combat asks for the next one (or finds there
+    # is none), so the turn a player dies on is left to record_death_turn.
+    for p1, p2 in moves:
+        yield p1, p2
+        record(combat.player1, p1)
+        record(combat.player2, p2)
+
+
+def special_attacks_played(combat, turns: int, death_turn: typing.Union[int, None]) -> dict[tuple[str, str], int]:
+    # Called once a combat is over, so the turn loop itself never pays for
+    # the instrumentation. Specials are found in one pass over the moves.
+    found = {}
+    record = collector(found)
+    completed = turns if death_turn is None else death_turn
+    for p1, p2 in zip(combat.player1moves[:completed], combat.player2moves[:completed]):
+        record(combat.player1, p1)
+        record(combat.player2, p2)
+
+    if death_turn is not None:
+        record_death_turn(combat, combat.player1moves[death_turn], combat.player2moves[death_turn], record)
+    return found
+
+
+def record_played(record) -> None:
+    # A combat played somewhere else, like a batch worker process, counted
+    # from the stats record it sent back.
+    record_outcome(record.turns, None if record.alive1 == record.alive2 else record.turns - 1)
+    record_special_attacks(record.special_attacks)
+
+
+def record_combat(combat, turns: int, death_turn: typing.Union[int, None], special_attacks: typing.Union[dict[tuple[str, str], int], None] = None) -> None:
+    record_outcome(turns, death_turn)
+    if special_attacks is None:
+        special_attacks = special_attacks_played(combat, turns, death_turn)
+    record_special_attacks(special_attacks)
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from talanakombat import cache
+from talanakombat import characters
+from talanakombat import matchup
+from talanakombat import validation
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+FORMATS = ('json', 'toml')
+
+# The built-in characters keep their classes, so combats between them look
+# exactly like the ones created by hand (and can be archived).
+CLASSES = {
+    characters.TonynStallone.TEMPLATE: characters.TonynStallone,
+    characters.ArnaldorShuatseneguer.TEMPLATE: characters.ArnaldorShuatseneguer,
+}
+
+
+class Roster:
+    # A validated set of characters, by id. Each character is compiled once
+    # into an immutable template, shared by every combat that uses it.
+    def __init__(self, templates: dict[str, characters.CharacterTemplate], defaults: tuple[str, str], digest: str) -> None:
+        self.__templates = templates
+        self.__defaults = defaults
+        self.__digest = digest
+
+    def __reduce__(self) -> tuple:
+        # Unpickled rosters are looked up by digest first, so a worker
+        # process reuses its templates (and their matchup tables) across
+        # tasks.
+        return restore, (self.__digest, self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.__templates)
+
+    def __contains__(self, character_id: str) -> bool:
+        return character_id in self.__templates
+
+    @property
+    def ids(self) -> list[str]:
+        return list(self.__templates)
+
+    @property
+    def defaults(self) -> tuple[str, str]:
+        return self.__defaults
+
+    @property
+    def digest(self) -> str:
+        return self.__digest
+
+    def template(self, character_id: str) -> characters.CharacterTemplate:
+        template = self.__templates.get(character_id) if type(character_id) is str else None
+        if template is None:
+            raise ValueError(f"Character must be one of {', '.join(self.__templates)}")
+        return template
+
+    def character(self, character_id: typing.Union[str, None] = None, player: int = 1) -> characters.BaseCharacter:
+        if character_id is None:
+            character_id = self.__defaults[player - 1]
+        template = self.template(character_id)
+        return CLASSES.get(template, characters.BaseCharacter).from_template(template)
+
+    def to_dict(self) -> dict:
+        return {
+            'characters': {character_id: template.to_dict() for character_id, template in self.__templates.items()},
+            'defaults': {'player1': self.__defaults[0], 'player2': self.__defaults[1]},
+        }
+
+
+def parse(data: dict, digest: str) -> Roster:
+    if type(data) is not dict:
+        raise TypeError('Roster must be a dictionary')
+    specs = data.get('characters', None)
+    if type(specs) is not dict or not specs:
+        raise ValueError('Roster must have a non empty dictionary of characters')
+
+    templates = {}
+    for character_id, spec in specs.items():
+        if not character_id:
+            raise ValueError('Character ids cannot be empty')
+        try:
+            if type(spec) is not dict:
+                raise TypeError('Characters must be dictionaries')
+            templates[character_id] = characters.CharacterTemplate(
+                spec['name'], spec['health'], spec['special_attacks'])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid character {character_id!r}: {e}") from e
+
+    # Without defaults, requests that don't pick their characters get the
+    # first two in the file (or the only one against itself).
+    ids = list(templates)
+    defaults = data.get('defaults', {})
+    if type(defaults) is not dict:
+        raise TypeError('Roster defaults must be a dictionary')
+    player1 = defaults.get('player1', ids[0])
+    player2 = defaults.get('player2', ids[1] if len(ids) > 1 else ids[0])
+    for default in (player1, player2):
+        if default not in templates:
+            raise ValueError(f"Default character {default!r} is not in the roster")
+
+    return Roster(templates, (player1, player2), digest)
+
+
+BUILTIN = Roster({
+    'tonyn': characters.TonynStallone.TEMPLATE,
+    'arnaldor': characters.ArnaldorShuatseneguer.TEMPLATE,
+}, ('tonyn', 'arnaldor'), 'builtin')
+
+compiled = cache.LRUCache(max_size=16)
+
+
+def restore(digest: str, data: dict) -> Roster:
+    if digest == BUILTIN.digest:
+        return BUILTIN
+    roster = compiled.get(digest)
+    if roster is None:
+        roster = parse(data, digest)
+        compiled.put(digest, roster)
+    return roster
+
+
+def loads(content: bytes, format: str = 'json') -> Roster:
+    # Rosters are cached by the hash of their content, so loading the same
+    # file again (or in another process) reuses the compiled characters.
+    if format not in FORMATS:
+        raise ValueError(f"Roster format must be one of {', '.join(FORMATS)}")
+
+    import hashlib
+    digest = hashlib.sha256(format.encode() + b'\0' + content).hexdigest()
+    roster = compiled.get(digest)
+    if roster is not None:
+        return roster
+
+    if format == 'toml':
+        import tomllib
+        data = tomllib.loads(content.decode())
+    else:
+        import json
+        data = json.loads(content)
+    roster = parse(data, digest)
+    compiled.put(digest, roster)
+    return roster
+
+
+def load(path: str) -> Roster:
+    format = os.path.splitext(path)[1].lstrip('.').lower()
+    with open(path, 'rb') as source:
+        return loads(source.read(), format)
+
+
+class RosterFile:
+    # Serves the roster in a file, checking at most every `interval` seconds
+    # whether the file changed. A roster that fails to load is reported in
+    # `error` and the previous one is kept, so a bad edit can't take the
+    # service down.
+    def __init__(self, path: str, interval: float = 1.0, clock: typing.Callable[[], float] = time.monotonic) -> None:
+        self.__path = path
+        self.__interval = interval
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__stat = self.stat()
+        self.__roster = load(path)
+        self.__checked_at = clock()
+        self.__error = None
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def error(self) -> typing.Union[str, None]:
+        return self.__error
+
+    def stat(self) -> typing.Union[tuple[int, int], None]:
+        try:
+            stat = os.stat(self.__path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self) -> Roster:
+        if self.__clock() - self.__checked_at < self.__interval:
+            return self.__roster
+
+        with self.__lock:
+            if self.__clock() - self.__checked_at >= self.__interval:
+                self.__checked_at = self.__clock()
+                stat = self.stat()
+                if stat != self.__stat:
+                    self.__stat = stat
+                    self.reload()
+        return self.__roster
+
+    def reload(self) -> None:
+        try:
+            roster = load(self.__path)
+        except (OSError, TypeError, ValueError) as e:
+            self.__error = f"{type(e).__name__}: {e}"
+            return
+
+        self.__error = None
+        if roster.digest != self.__roster.digest:
+            self.__roster = roster
+            # Tables built for the old characters can't be used again.
+            matchup.clear()
+            validation.clear()
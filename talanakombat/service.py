@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from talanakombat import characters
+from talanakombat import exceptions
+from talanakombat import metrics
+from talanakombat import rosters
+from talanakombat import stats
+from talanakombat import validation
+from talanakombat.combat import Combat
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+
+def get_player(data: dict, number: int, required: bool = True) -> dict:
+    spanish = f"jugador{number}"
+    english = f"player{number}"
+    if spanish in data:
+        player = data[spanish]
+    else:
+        player = data[english] if required else data.get(english, {})
+    if type(player) is not dict:
+        raise TypeError(f"Player {number} must be a dictionary")
+    return player
+
+
+def get_moves(player: dict) -> list[str]:
+    movements = player['movimientos'] if 'movimientos' in player else player['movements']
+    attacks = player['golpes'] if 'golpes' in player else player['attacks']
+
+    moves = [f"{m}+{a}" if m != '' and a !=
+             '' else m or a for m, a in zip(movements, attacks)]
+
+    return [move.upper() if type(move) is str else move for move in moves]
+
+
+def get_move(player: dict) -> str:
+    movement = player['movimiento'] if 'movimiento' in player else player.get('movement', '')
+    attack = player['golpe'] if 'golpe' in player else player.get('attack', '')
+
+    move = f"{movement}+{attack}" if movement != '' and attack != '' else movement or attack
+
+    return move.upper() if type(move) is str else move
+
+
+def get_character(player: dict, roster: rosters.Roster, number: int) -> characters.BaseCharacter:
+    character_id = player['personaje'] if 'personaje' in player else player.get('character', None)
+    return roster.character(character_id, number)
+
+
+def get_seed(data: dict) -> typing.Union[int, str, None]:
+    # The seed is part of the cache key, so it must be hashable as well as
+    # something the narration generator accepts.
+    seed = data['semilla'] if 'semilla' in data else data.get('seed', None)
+    if seed is not None and type(seed) not in (int, str):
+        raise TypeError('Seed must be an integer, a string or null')
+    return seed
+
+
+def prepare(data: dict, roster: rosters.Roster = rosters.BUILTIN) -> Combat:
+    p1 = get_player(data, 1)
+    p2 = get_player(data, 2)
+
+    player1moves = get_moves(p1)
+    player2moves = get_moves(p2)
+    # The combat only keeps its moves when both sides have some, so an empty
+    # side is reported here, while it is still known which one it was.
+    validation.check_sides(player1moves, player2moves)
+
+    player1 = get_character(p1, roster, 1)
+    player2 = get_character(p2, roster, 2)
+
+    combat = Combat(
+        player1=player1,
+        player2=player2,
+        player1moves=player1moves,
+        player2moves=player2moves,
+        seed=get_seed(data)
+    )
+    # Every move is checked before anything is played, so a bad request
+    # costs a single pass over its moves and reports all of its errors.
+    validation.check_combat(combat)
+
+    return combat
+
+
+def cache_key(combat: Combat, narration: bool, locale: str = 'en') -> typing.Union[tuple, None]:
+    # Without a seed the narration verbs are random, so only the outcome can
+    # be reused.
+    if narration and combat.seed is None:
+        return None
+
+    # Templates are compared by identity, so a reloaded roster never gets
+    # results played with the old characters.
+    return (
+        combat.player1.template,
+        combat.player2.template,
+        tuple(combat.player1moves),
+        tuple(combat.player2moves),
+        combat.seed if narration else None,
+        narration,
+        locale if narration else None,
+    )
+
+
+def summarize(combat: Combat) -> dict:
+    player1 = combat.player1
+    player2 = combat.player2
+
+    return {
+        'winner': combat.outcome_event().winner,
+        'player1': {
+            'name': player1.name,
+            'health': player1.health,
+            'moves': combat.player1moves,
+        },
+        'player2': {
+            'name': player2.name,
+            'health': player2.health,
+            'moves': combat.player2moves,
+        }
+    }
+
+
+def play_combat(combat: Combat, narration: bool = True, locale: str = 'en') -> dict:
+    if not narration:
+        outcome = combat.resolve()
+        result = summarize(combat)
+        result['death_turn'] = outcome['death_turn']
+        return result
+
+    gen = combat.fight(locale)
+
+    narration = [move for move in gen]
+
+    result = summarize(combat)
+
+    # The narrated response has always named player 2 the winner of a draw,
+    # and keeps doing so.
+    player1 = combat.player1
+    return {
+        'winner': player1.name if player1.is_alive() else combat.player2.name,
+        'narration': narration,
+        'player1': result['player1'],
+        'player2': result['player2'],
+    }
+
+
+def play(data: dict, narration: bool = True, locale: str = 'en', roster: rosters.Roster = rosters.BUILTIN) -> dict:
+    return play_combat(prepare(data, roster), narration, locale)
+
+
+def describe_error(e: Exception) -> dict:
+    error = {'error': f"{type(e).__name__}: {e}"}
+    if isinstance(e, exceptions.InvalidMovesException):
+        error['errors'] = e.errors
+    return error
+
+
+def count_record(record: stats.Record) -> None:
+    # Counts a combat played by another process in this one's metrics and
+    # stats.
+    if metrics.enabled:
+        metrics.record_played(record)
+    if stats.enabled:
+        stats.STATS.add(record)
+
+
+def play_recorded(data: dict, narration: bool = True, locale: str = 'en', roster: rosters.Roster = rosters.BUILTIN,
+                  record: bool = False) -> tuple[dict, typing.Union[stats.Record, None]]:
+    # Played by the batch worker processes, whose own metrics and stats are
+    # never read. With record set the combat keeps its stats record, and it
+    # is returned with the result to be counted with count_record.
+    if record and not metrics.enabled:
+        metrics.enable()
+    try:
+        combat = prepare(data, roster)
+        return play_combat(combat, narration, locale), combat.stats_record
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return describe_error(e), None
+
+
+def play_safely(data: dict, narration: bool = True, locale: str = 'en', roster: rosters.Roster = rosters.BUILTIN) -> dict:
+    try:
+        return play(data, narration, locale, roster)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return describe_error(e)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import secrets
+import threading
+
+from talanakombat import cache
+from talanakombat import characters
+from talanakombat import events
+from talanakombat import validation
+from talanakombat.combat import Combat
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+
+class Session:
+    def __init__(self, **kwargs) -> None:
+        player1 = kwargs.get('player1', None) or characters.TonynStallone()
+        player2 = kwargs.get('player2', None) or characters.ArnaldorShuatseneguer()
+
+        self.__id = secrets.token_urlsafe(16)
+        self.__combat = Combat(player1=player1, player2=player2,
+                               seed=kwargs.get('seed', None))
+        self.__combat.check_players()
+        self.__locale = kwargs.get('locale', 'en')
+        events.get_locale(self.__locale)
+        self.__turns = 0
+        self.__finished = False
+        self.__lock = threading.Lock()
+
+    @property
+    def id(self) -> str:
+        return self.__id
+
+    @property
+    def combat(self) -> Combat:
+        return self.__combat
+
+    @property
+    def locale(self) -> str:
+        return self.__locale
+
+    @property
+    def turns(self) -> int:
+        return self.__turns
+
+    @property
+    def finished(self) -> bool:
+        return self.__finished
+
+    def state(self) -> dict:
+        player1 = self.__combat.player1
+        player2 = self.__combat.player2
+        winner = None
+        if self.__finished and player1.is_alive() != player2.is_alive():
+            winner = player1.name if player1.is_alive() else player2.name
+
+        return {
+            'id': self.__id,
+            'turns': self.__turns,
+            'finished': self.__finished,
+            'winner': winner,
+            'player1': {'name': player1.name, 'health': player1.health},
+            'player2': {'name': player2.name, 'health': player2.health},
+        }
+
+    def play_turn(self, player1move: str, player2move: str) -> dict:
+        if type(player1move) is not str:
+            raise TypeError('Player 1 move must be a string')
+        if type(player2move) is not str:
+            raise TypeError('Player 2 move must be a string')
+
+        # Each turn only plays the new moves against the players' current
+        # health, so its cost doesn't depend on how long the session is.
+        with self.__lock:
+            if self.__finished:
+                raise ValueError('Session has already finished')
+
+            # Both moves are checked first, like the moves of /combat, so an
+            # invalid one can't leave the turn half played.
+            validation.check(self.__combat.player1, self.__combat.player2, [player1move], [player2move])
+
+            narration = []
+            turn = self.__combat.play_turn(player1move, player2move, self.__locale)
+            try:
+                while True:
+                    narration.append(next(turn))
+            except StopIteration as stop:
+                alive = stop.value
+            self.__turns += 1
+
+            if not alive:
+                self.__finished = True
+                narration.append(self.__combat.describe_outcome(self.__locale))
+
+            return {**self.state(), 'narration': narration}
+
+    def finish(self) -> dict:
+        with self.__lock:
+            narration = []
+            if not self.__finished:
+                self.__finished = True
+                narration.append(self.__combat.describe_outcome(self.__locale))
+
+            return {**self.state(), 'narration': narration}
+
+
+class SessionStore:
+    def __init__(self, max_sessions: int = 1024, ttl: typing.Union[float, None] = 3600, **kwargs) -> None:
+        self.__sessions = cache.LRUCache(max_size=max_sessions, ttl=ttl, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.__sessions)
+
+    def create(self, **kwargs) -> Session:
+        session = Session(**kwargs)
+        self.__sessions.put(session.id, session)
+        return session
+
+    def get(self, session_id: str) -> typing.Union[Session, None]:
+        # Reading a session refreshes it, so its TTL counts from the last turn
+        # played rather than from its creation.
+        session = self.__sessions.get(session_id)
+        if session is not None:
+            self.__sessions.put(session_id, session)
+        return session
+
+    def delete(self, session_id: str) -> typing.Union[Session, None]:
+        return self.__sessions.pop(session_id)
+
+    def stats(self) -> dict:
+        return self.__sessions.stats()
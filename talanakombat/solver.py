@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import contextlib
+import sys
+import time
+
+from talanakombat import characters
+from talanakombat import combat
+from talanakombat import exceptions
+from talanakombat import matchup
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+ATTACKS = ('', 'P', 'K')
+
+
+@contextlib.contextmanager
+def recursion_limit(depth: int):
+    previous = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(previous, depth))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(previous)
+
+
+class Solver:
+    def __init__(self, **kwargs) -> None:
+        player1 = kwargs.get('player1', None) or characters.TonynStallone()
+        player2 = kwargs.get('player2', None) or characters.ArnaldorShuatseneguer()
+        max_nodes = kwargs.get('max_nodes', None)
+        max_seconds = kwargs.get('max_seconds', None)
+        if max_nodes is not None and (type(max_nodes) is not int or max_nodes <= 0):
+            raise ValueError('Max nodes must be an integer greater than 0')
+        if max_seconds is not None and (type(max_seconds) not in (int, float) or max_seconds <= 0):
+            raise ValueError('Max seconds must be a number greater than 0')
+
+        self.__combat = combat.Combat(player1=player1, player2=player2)
+        self.__max_nodes = max_nodes
+        self.__max_seconds = max_seconds
+        self.__moves1 = Solver.move_classes(player1)
+        self.__moves2 = Solver.move_classes(player2)
+        self.__order = {}
+        self.__nodes = 0
+        self.__deadline = None
+
+    @property
+    def player1(self) -> characters.BaseCharacter:
+        return self.__combat.player1
+
+    @property
+    def player2(self) -> characters.BaseCharacter:
+        return self.__combat.player2
+
+    @property
+    def nodes(self) -> int:
+        return self.__nodes
+
+    @staticmethod
+    def legal_moves(player: characters.BaseCharacter) -> list[str]:
+        moves = [f"{movement}+{attack}" if movement and attack else movement or attack
+                 for movement in characters.MOVEMENTS
+                 for attack in ATTACKS]
+        known = set(moves)
+        for combo in player.special_attacks:
+            if combo in known:
+                continue
+            try:
+                player.move_damage(combo)
+            except (TypeError, ValueError):
+                continue
+            moves.append(combo)
+            known.add(combo)
+        return moves
+
+    @staticmethod
+    def move_classes(player: characters.BaseCharacter) -> dict[str, int]:
+        # decide_order only looks at the length of the move and of its
+        # movement part, so moves that share both lengths and their damage
+        # are interchangeable and only one of them needs to be searched.
+        # Stronger moves go first, so winning lines are found and cut early.
+        classes = {}
+        for move in Solver.legal_moves(player):
+            damage = player.move_damage(move)
+            key = (len(move), len(move.split('+')[0]), damage)
+            if key not in classes:
+                classes[key] = (move, damage)
+        return dict(sorted(classes.values(), key=lambda item: -item[1]))
+
+    def player1_first(self, player1move: str, player2move: str) -> bool:
+        key = (player1move, player2move)
+        first = self.__order.get(key)
+        if first is None:
+            first = self.__order[key] = matchup.player1_first(player1move, player2move)
+        return first
+
+    def step(self, health1: int, health2: int, player1move: str, player2move: str, damage1: int, damage2: int) -> tuple[int, int, typing.Union[int, None]]:
+        if self.player1_first(player1move, player2move):
+            health2 -= damage1
+            if health2 <= 0:
+                return health1, 0, 1
+            health1 -= damage2
+            if health1 <= 0:
+                return 0, health2, -1
+        else:
+            health1 -= damage2
+            if health1 <= 0:
+                return 0, health2, -1
+            health2 -= damage1
+            if health2 <= 0:
+                return health1, 0, 1
+        return health1, health2, None
+
+    def visit(self) -> None:
+        self.__nodes += 1
+        if self.__max_nodes is not None and self.__nodes > self.__max_nodes:
+            raise exceptions.SearchBudgetException(
+                f"Search exceeded {self.__max_nodes} nodes")
+        if self.__deadline is not None and self.__nodes % 1024 == 0 and time.monotonic() > self.__deadline:
+            raise exceptions.SearchBudgetException(
+                f"Search exceeded {self.__max_seconds} seconds")
+
+    def deepen(self, turns: int, search: typing.Callable[[int], dict]) -> dict:
+        # Horizons double until the requested number of turns, so when the
+        # budget runs out the deepest completed search is returned.
+        self.__nodes = 0
+        self.__deadline = None if self.__max_seconds is None else time.monotonic() + self.__max_seconds
+
+        result = None
+        horizon = 1
+        with recursion_limit(turns + 1000):
+            while True:
+                horizon = min(horizon, turns)
+                try:
+                    result = search(horizon)
+                except exceptions.SearchBudgetException:
+                    if result is None:
+                        raise
+                    break
+                result['complete'] = horizon == turns
+                if horizon == turns:
+                    break
+                horizon *= 2
+
+        result['nodes'] = self.__nodes
+        return result
+
+    def best_reply(self, opponent_moves: list[str], **kwargs) -> dict:
+        player = kwargs.get('player', 2)
+        turns = kwargs.get('turns', len(opponent_moves))
+        if player not in (1, 2):
+            raise ValueError('Player must be 1 or 2')
+        if type(opponent_moves) is not list or not opponent_moves:
+            raise TypeError('Opponent moves must be a non empty list of strings')
+        if type(turns) is not int or turns < len(opponent_moves):
+            raise ValueError('Turns must be an integer not lower than the number of opponent moves')
+
+        opponent = self.player2 if player == 1 else self.player1
+        own_moves = self.__moves1 if player == 1 else self.__moves2
+        padded = opponent_moves + [''] * (turns - len(opponent_moves))
+        opponent_damage = [opponent.move_damage(move) for move in padded]
+
+        def play(health1: int, health2: int, turn: int, move: str, damage: int) -> tuple[int, int, typing.Union[int, None]]:
+            if player == 1:
+                return self.step(health1, health2, move, padded[turn], damage, opponent_damage[turn])
+            return self.step(health1, health2, padded[turn], move, opponent_damage[turn], damage)
+
+        def search(horizon: int) -> dict:
+            table = {}
+            sign = 1 if player == 1 else -1
+
+            def value(health1: int, health2: int, turn: int) -> int:
+                if turn == horizon:
+                    return 0
+                key = (health1, health2, turn)
+                if key in table:
+                    return table[key][0]
+
+                best = None
+                for move, damage in own_moves.items():
+                    self.visit()
+                    next1, next2, outcome = play(health1, health2, turn, move, damage)
+                    result = sign * outcome if outcome is not None else value(next1, next2, turn + 1)
+                    if best is None or result > best[0]:
+                        best = (result, move)
+                    if result == 1:
+                        break
+                table[key] = best
+                return best[0]
+
+            health1, health2 = self.player1.health, self.player2.health
+            root = value(health1, health2, 0)
+
+            moves = []
+            for turn in range(horizon):
+                move = table[(health1, health2, turn)][1]
+                moves.append(move)
+                health1, health2, outcome = play(
+                    health1, health2, turn, move, own_moves[move])
+                if outcome is not None:
+                    break
+
+            return {'value': root, 'moves': moves, 'turns': horizon}
+
+        return self.deepen(turns, search)
+
+    def value(self, turns: int) -> dict:
+        if type(turns) is not int or turns <= 0:
+            raise ValueError('Turns must be an integer greater than 0')
+
+        # Values only depend on the health of both players and the turns
+        # left, so the table is shared by every horizon of the deepening.
+        table = {}
+
+        def value(health1: int, health2: int, left: int) -> int:
+            if left == 0:
+                return 0
+            key = (health1, health2, left)
+            if key in table:
+                return table[key][0]
+
+            # Player 2 answers knowing player 1's move, so this is the value
+            # player 1 can guarantee with pure strategies.
+            best = None
+            for move1, damage1 in self.__moves1.items():
+                worst = None
+                for move2, damage2 in self.__moves2.items():
+                    self.visit()
+                    next1, next2, outcome = self.step(
+                        health1, health2, move1, move2, damage1, damage2)
+                    result = outcome if outcome is not None else value(next1, next2, left - 1)
+                    if worst is None or result < worst[0]:
+                        worst = (result, move2)
+                    if result == -1 or (best is not None and result <= best[0]):
+                        break
+                if best is None or worst[0] > best[0]:
+                    best = (worst[0], move1, worst[1])
+                if best[0] == 1:
+                    break
+            table[key] = best
+            return best[0]
+
+        def search(horizon: int) -> dict:
+            health1, health2 = self.player1.health, self.player2.health
+            root = value(health1, health2, horizon)
+
+            player1moves = []
+            player2moves = []
+            for left in range(horizon, 0, -1):
+                _, move1, move2 = table[(health1, health2, left)]
+                player1moves.append(move1)
+                player2moves.append(move2)
+                health1, health2, outcome = self.step(
+                    health1, health2, move1, move2, self.__moves1[move1], self.__moves2[move2])
+                if outcome is not None:
+                    break
+
+            return {
+                'value': root,
+                'player1moves': player1moves,
+                'player2moves': player2moves,
+                'turns': horizon,
+            }
+
+        return self.deepen(turns, search)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import collections
+import threading
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+enabled = False
+
+# Openings are the first moves of each player, counted per character.
+OPENING_TURNS = 3
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+class CountMinSketch:
+    # Estimates how many times each key was added using `depth` rows of
+    # `width` counters, whatever the number of distinct keys. A key adds to
+    # one counter per row and its estimate is the smallest of them, which is
+    # never below its real count.
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        if type(width) is not int or type(depth) is not int:
+            raise TypeError('Width and depth must be integers greater than 0')
+        if width <= 0 or depth <= 0:
+            raise ValueError('Width and depth must be integers greater than 0')
+
+        self.__width = width
+        self.__depth = depth
+        self.__rows = [[0] * width for _ in range(depth)]
+        self.__total = 0
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @property
+    def depth(self) -> int:
+        return self.__depth
+
+    @property
+    def total(self) -> int:
+        return self.__total
+
+    def indexes(self, key: typing.Hashable) -> typing.Iterator[int]:
+        # Each row scrambles the key's hash with its own constant (SplitMix64),
+        # so two keys that share a counter in one row are no more likely to
+        # share one in the others, and a rare key can't take the count of a
+        # frequent one.
+        value = hash(key) & MASK64
+        for row in range(self.__depth):
+            mixed = (value + GOLDEN_GAMMA * (row + 1)) & MASK64
+            mixed = ((mixed ^ (mixed >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+            mixed = ((mixed ^ (mixed >> 27)) * 0x94D049BB133111EB) & MASK64
+            yield (mixed ^ (mixed >> 31)) % self.__width
+
+    def add(self, key: typing.Hashable, count: int = 1) -> int:
+        estimate = None
+        for row, index in zip(self.__rows, self.indexes(key)):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        self.__total += count
+        return estimate
+
+    def estimate(self, key: typing.Hashable) -> int:
+        return min(row[index] for row, index in zip(self.__rows, self.indexes(key)))
+
+    def clear(self) -> None:
+        self.__rows = [[0] * self.__width for _ in range(self.__depth)]
+        self.__total = 0
+
+
+class TopK:
+    # The `k` most frequent keys, with counts estimated by a count-min
+    # sketch. Only the current top keys are stored, so memory doesn't grow
+    # with the number of distinct keys seen.
+    def __init__(self, k: int = 20, width: int = 2048, depth: int = 4) -> None:
+        if type(k) is not int:
+            raise TypeError('K must be an integer greater than 0')
+        if k <= 0:
+            raise ValueError('K must be an integer greater than 0')
+
+        self.__k = k
+        self.__sketch = CountMinSketch(width, depth)
+        self.__top = {}
+
+    @property
+    def k(self) -> int:
+        return self.__k
+
+    @property
+    def sketch(self) -> CountMinSketch:
+        return self.__sketch
+
+    def __len__(self) -> int:
+        return len(self.__top)
+
+    def add(self, key: typing.Hashable, count: int = 1) -> None:
+        estimate = self.__sketch.add(key, count)
+        if key in self.__top or len(self.__top) < self.__k:
+            self.__top[key] = estimate
+            return
+
+        smallest = min(self.__top, key=self.__top.__getitem__)
+        if estimate > self.__top[smallest]:
+            del self.__top[smallest]
+            self.__top[key] = estimate
+
+    def items(self) -> list[tuple[typing.Hashable, int]]:
+        return sorted(self.__top.items(), key=lambda item: item[1], reverse=True)
+
+    def clear(self) -> None:
+        self.__sketch.clear()
+        self.__top.clear()
+
+
+# Everything a combat adds to the stats, so a result served from a cache can
+# add its combat again without replaying it. special_attacks counts the
+# special attacks played by (character, attack).
+Record = collections.namedtuple('Record', ('player1', 'player2', 'alive1', 'alive2', 'turns', 'opening', 'special_attacks'))
+
+
+class Stats:
+    # Aggregates of every combat played while enabled. Outcomes, turns and
+    # special attacks are exact counters, which only grow with the number of
+    # characters, and openings are kept in a top-K sketch.
+    def __init__(self, top: int = 20, width: int = 2048, depth: int = 4) -> None:
+        self.__lock = threading.Lock()
+        self.__openings = TopK(top, width, depth)
+        self.__combats = 0
+        self.__draws = 0
+        self.__turns = 0
+        self.__characters = {}
+        self.__special_attacks = {}
+
+    @property
+    def combats(self) -> int:
+        return self.__combats
+
+    def add(self, record: Record) -> None:
+        with self.__lock:
+            for key, count in record.special_attacks.items():
+                self.__special_attacks[key] = self.__special_attacks.get(key, 0) + count
+            self.__combats += 1
+            self.__turns += record.turns
+            if record.alive1 == record.alive2:
+                self.__draws += 1
+            for name, alive, other_alive in ((record.player1, record.alive1, record.alive2),
+                                             (record.player2, record.alive2, record.alive1)):
+                counts = self.__characters.setdefault(name, [0, 0, 0, 0])
+                counts[0] += 1
+                if alive and not other_alive:
+                    counts[1] += 1
+                elif other_alive and not alive:
+                    counts[2] += 1
+                else:
+                    counts[3] += 1
+            if record.opening:
+                self.__openings.add((record.player1, tuple(p1 for p1, _ in record.opening)))
+                self.__openings.add((record.player2, tuple(p2 for _, p2 in record.opening)))
+
+    def to_dict(self) -> dict:
+        with self.__lock:
+            characters = {}
+            for name, (combats, wins, losses, draws) in self.__characters.items():
+                characters[name] = {
+                    'combats': combats,
+                    'wins': wins,
+                    'losses': losses,
+                    'draws': draws,
+                    'win_rate': wins / combats,
+                }
+            special_attacks = {}
+            for (name, attack), count in self.__special_attacks.items():
+                special_attacks.setdefault(name, {})[attack] = count
+
+            return {
+                'combats': self.__combats,
+                'draws': self.__draws,
+                'average_turns': self.__turns / self.__combats if self.__combats else None,
+                'characters': characters,
+                'special_attacks': special_attacks,
+                'openings': [
+                    {'character': name, 'moves': list(moves), 'count': count}
+                    for (name, moves), count in self.__openings.items()
+                ],
+            }
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__openings.clear()
+            self.__combats = 0
+            self.__draws = 0
+            self.__turns = 0
+            self.__characters.clear()
+            self.__special_attacks.clear()
+
+
+STATS = Stats()
+
+
+def watch_moves(moves: typing.Iterable[tuple[str, str]], opening: list) -> typing.Iterator[tuple[str, str]]:
+    # Streamed moves can't be read again, so the opening is kept as the
+    # combat plays it.
+    for pair in moves:
+        if len(opening) < OPENING_TURNS:
+            opening.append(pair)
+        yield pair
+
+
+def make_record(combat, turns: int, special_attacks: dict[tuple[str, str], int], opening: typing.Union[list, None] = None) -> Record:
+    # Called once a combat is over, like metrics.record_combat, with the
+    # special attacks the combat found for both.
+    if opening is None:
+        opening = list(zip(combat.player1moves[:min(turns, OPENING_TURNS)],
+                           combat.player2moves[:min(turns, OPENING_TURNS)]))
+    return Record(combat.player1.name, combat.player2.name,
+                  combat.player1.is_alive(), combat.player2.is_alive(),
+                  turns, tuple(opening), special_attacks)
+
+
+def record_combat(combat, turns: int, special_attacks: dict[tuple[str, str], int], opening: typing.Union[list, None] = None) -> Record:
+    record = make_record(combat, turns, special_attacks, opening)
+    STATS.add(record)
+    return record
@@ -0,0 +1,128 @@
+import concurrent.futures
+import itertools
+import os
+
+from talanakombat import characters
+from talanakombat import combat
+
+# Pool workers receive the roster specs and move pools once, through the
+# initializer, and build their own characters. Tasks only carry indexes.
+worker_roster = None
+worker_move_pools = None
+
+
+def build_character(spec: dict) -> characters.BaseCharacter:
+    return characters.BaseCharacter(spec['name'], spec['health'], spec['special_attacks'])
+
+
+def init_worker(specs: list[dict], pools: list[list[list[str]]]) -> None:
+    global worker_roster, worker_move_pools
+    worker_roster = [build_character(spec) for spec in specs]
+    worker_move_pools = pools
+
+
+def play_pairings(pairings: list[tuple[int, int]]) -> list[tuple[int, int, int, int, int]]:
+    results = []
+    for i, j in pairings:
+        wins = draws = losses = 0
+        for player1moves, player2moves in itertools.product(worker_move_pools[i], worker_move_pools[j]):
+            # Characters built from the template share its validated combos
+            # and only get their own health, which is all a combat changes.
+            player1 = characters.BaseCharacter.from_template(worker_roster[i].template)
+            player2 = characters.BaseCharacter.from_template(worker_roster[j].template)
+            winner = combat.Combat(
+                player1=player1,
+                player2=player2,
+                player1moves=list(player1moves),
+                player2moves=list(player2moves)
+            ).resolve()['winner']
+            if winner is player1:
+                wins += 1
+            elif winner is player2:
+                losses += 1
+            else:
+                draws += 1
+        results.append((i, j, wins, draws, losses))
+    return results
+
+
+class Tournament:
+    def __init__(self, roster: list[dict], move_pools: dict[str, list[list[str]]], **kwargs) -> None:
+        if type(roster) is not list or len(roster) < 2:
+            raise ValueError('Roster must be a list of at least two characters')
+        if type(move_pools) is not dict:
+            raise TypeError('Move pools must be a dictionary')
+
+        players = [build_character(spec) for spec in roster]
+        names = [player.name for player in players]
+        if len(set(names)) != len(names):
+            raise ValueError('Character names must be unique')
+
+        pools = []
+        for player in players:
+            pool = move_pools.get(player.name)
+            if not pool:
+                raise ValueError(f"{player.name} must have a non empty move pool")
+            for moves in pool:
+                if type(moves) is not list or not moves:
+                    raise ValueError(f"{player.name} move lists must be non empty lists of strings")
+                for move in moves:
+                    player.move_damage(move)
+            pools.append(pool)
+
+        self.__specs = [{
+            'name': spec['name'],
+            'health': spec['health'],
+            'special_attacks': spec['special_attacks'],
+        } for spec in roster]
+        self.__names = names
+        self.__pools = pools
+        self.__workers = kwargs.get('workers', os.cpu_count() or 1)
+        self.__chunksize = kwargs.get('chunksize', 8)
+        self.__swap_sides = kwargs.get('swap_sides', False)
+
+    @property
+    def names(self) -> list[str]:
+        return self.__names
+
+    def pairings(self) -> list[tuple[int, int]]:
+        pairings = list(itertools.combinations(range(len(self.__names)), 2))
+        if self.__swap_sides:
+            pairings += [(j, i) for i, j in pairings]
+        return pairings
+
+    def run(self) -> dict:
+        pairings = self.pairings()
+        chunks = [pairings[start:start + self.__chunksize]
+                  for start in range(0, len(pairings), self.__chunksize)]
+
+        if self.__workers <= 1:
+            init_worker(self.__specs, self.__pools)
+            results = map(play_pairings, chunks)
+        else:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.__workers,
+                initializer=init_worker,
+                initargs=(self.__specs, self.__pools))
+            with executor:
+                results = list(executor.map(play_pairings, chunks))
+
+        size = len(self.__names)
+        wins = [[0] * size for _ in range(size)]
+        draws = [[0] * size for _ in range(size)]
+        losses = [[0] * size for _ in range(size)]
+        for chunk in results:
+            for i, j, won, drawn, lost in chunk:
+                wins[i][j] += won
+                losses[j][i] += won
+                draws[i][j] += drawn
+                draws[j][i] += drawn
+                losses[i][j] += lost
+                wins[j][i] += lost
+
+        return {
+            'names': self.__names,
+            'wins': wins,
+            'draws': draws,
+            'losses': losses,
+        }
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import itertools
+
+from talanakombat import cache
+from talanakombat import characters
+from talanakombat import exceptions
+from talanakombat import matchup
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import typing
+
+# Only the first errors are reported, so a huge request full of bad moves
+# can't turn into an even bigger response.
+MAX_ERRORS = 100
+
+
+class Grammar:
+    # A move is a movement of up to 5 W, A, S or D followed by one of the
+    # character's combos, matched by the template's combo trie exactly as the
+    # combat does. Each distinct move is checked once and its verdict kept.
+    def __init__(self, template: characters.CharacterTemplate, max_size: int = 65536) -> None:
+        self.__player = characters.BaseCharacter.from_template(template)
+        self.__max_size = max_size
+        self.__verdicts = {}
+
+    def check(self, move: typing.Any) -> typing.Union[str, None]:
+        try:
+            return self.__verdicts[move]
+        except KeyError:
+            pass
+        except TypeError:
+            return 'Move must be a string'
+
+        try:
+            matchup.move_info(self.__player, move)
+            verdict = None
+        except (AssertionError, TypeError, ValueError) as e:
+            verdict = str(e)
+
+        if len(self.__verdicts) >= self.__max_size:
+            self.__verdicts.clear()
+        self.__verdicts[move] = verdict
+        return verdict
+
+
+grammars = cache.LRUCache(max_size=256)
+
+
+def get(template: characters.CharacterTemplate) -> Grammar:
+    grammar = grammars.get(template)
+    if grammar is None:
+        grammar = Grammar(template)
+        grammars.put(template, grammar)
+    return grammar
+
+
+def validate(player1: characters.BaseCharacter, player2: characters.BaseCharacter, player1moves: typing.Iterable, player2moves: typing.Iterable) -> list[dict]:
+    # Both lists are read in a single pass, the shorter one padded with empty
+    # moves like the combat does.
+    check1 = get(player1.template).check
+    check2 = get(player2.template).check
+    errors = []
+    for turn, (p1, p2) in enumerate(itertools.zip_longest(player1moves, player2moves, fillvalue='')):
+        for player, check, move in ((1, check1, p1), (2, check2, p2)):
+            reason = check(move)
+            if reason is not None:
+                errors.append({'turn': turn, 'player': player, 'move': move, 'reason': reason})
+                if len(errors) >= MAX_ERRORS:
+                    return errors
+    return errors
+
+
+def check(player1: characters.BaseCharacter, player2: characters.BaseCharacter, player1moves: typing.Iterable, player2moves: typing.Iterable) -> None:
+    errors = validate(player1, player2, player1moves, player2moves)
+    if errors:
+        first = errors[0]
+        raise exceptions.InvalidMovesException(
+            f"Invalid move for player {first['player']} on turn {first['turn']}: {first['reason']}", errors)
+
+
+def check_sides(player1moves: typing.Any, player2moves: typing.Any) -> None:
+    # A side without moves can't be padded into a combat, so it's rejected
+    # with the same error list as a bad move.
+    errors = [{'turn': None, 'player': player, 'move': None, 'reason': 'Moves must be a non empty list'}
+              for player, moves in ((1, player1moves), (2, player2moves)) if not moves]
+    if errors:
+        raise exceptions.InvalidMovesException(f"Player {errors[0]['player']} has no moves", errors)
+
+
+def check_combat(combat) -> None:
+    combat.check_players()
+    check_sides(combat.player1moves, combat.player2moves)
+    check(combat.player1, combat.player2, combat.player1moves, combat.player2moves)
+
+
+def clear() -> None:
+    grammars.clear()
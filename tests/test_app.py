@@ -0,0 +1,209 @@
+import json
+
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import metrics
+from talanakombat import stats
+import app as service_app
+
+COMBAT = {
+    'player1': {'movements': ['D', 'DSD', 'S', 'DSD', 'SD'], 'attacks': ['K', 'P', '', 'K', 'P']},
+    'player2': {'movements': ['SA', 'SA', 'SA', 'ASA', 'SA'], 'attacks': ['K', '', 'K', 'P', 'P']},
+}
+DRAW = {
+    'player1': {'movements': ['W'], 'attacks': ['']},
+    'player2': {'movements': ['W'], 'attacks': ['']},
+}
+
+
+@pytest.fixture
+def client():
+    service_app.results_cache.clear()
+    return service_app.app.test_client()
+
+
+class TestCombat:
+    def test_combat(self, client):
+        response = client.post('/combat', json=COMBAT)
+        assert response.status_code == 200
+        assert response.get_json()['winner'] == 'Arnaldor Shuatseneguer'
+
+    def test_draw_has_no_winner(self, client):
+        response = client.post('/combat?narration=false', json=DRAW)
+        assert response.get_json()['winner'] is None
+        assert response.get_json()['death_turn'] is None
+
+    @pytest.mark.parametrize('seed', [[1], {'a': 1}, 1.5])
+    def test_rejects_invalid_seeds(self, client, seed):
+        for path in ('/combat', '/combat?narration=false', '/combat/stream'):
+            response = client.post(path, json={**COMBAT, 'seed': seed})
+            assert response.status_code == 400
+            assert response.get_json()['error'] == 'TypeError: Seed must be an integer, a string or null'
+
+    def test_cached_results_are_counted_in_stats(self, client):
+        stats.STATS.clear()
+        stats.enable()
+        hits = service_app.results_cache.stats()['hits']
+        try:
+            for path in ['/combat'] * 5 + ['/combat?narration=false'] * 2:
+                assert client.post(path, json={**COMBAT, 'seed': 7}).status_code == 200
+        finally:
+            stats.disable()
+        assert client.get('/combat/cache').get_json()['hits'] - hits == 5
+
+        summary = client.get('/stats').get_json()
+        stats.STATS.clear()
+        assert summary['combats'] == 7
+        assert summary['characters']['Arnaldor Shuatseneguer']['wins'] == 7
+        assert summary['special_attacks']['Arnaldor Shuatseneguer'] == {'Remuyuken': 14}
+        assert {'character': 'Tonyn Stallone', 'moves': ['D+K', 'DSD+P', 'S'], 'count': 7} in summary['openings']
+
+
+class TestStream:
+    def test_ndjson(self, client):
+        response = client.post('/combat/stream', json=COMBAT)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [line['event'] for line in lines] == ['narration'] * 8 + ['summary']
+        assert lines[-2]['narration'] == 'Arnaldor Shuatseneguer is the winner and has 2 health'
+        assert lines[-1]['winner'] == 'Arnaldor Shuatseneguer'
+
+    def test_draw_has_no_winner(self, client):
+        response = client.post('/combat/stream', json=DRAW)
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines[-1]['event'] == 'summary'
+        assert lines[-1]['winner'] is None
+
+    def test_sse(self, client):
+        response = client.post('/combat/stream', json=COMBAT, headers={'Accept': 'text/event-stream'})
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        events = response.get_data(as_text=True).split('\n\n')[:-1]
+        name, data = events[0].split('\n')
+        assert name == 'event: narration'
+        assert json.loads(data[len('data: '):])['narration'].startswith('Tonyn Stallone moved right, and ')
+        assert events[-1].startswith('event: summary\ndata: ')
+
+    def test_invalid_combats_are_rejected_before_streaming(self, client):
+        empty = {**COMBAT, 'player1': {'movements': [], 'attacks': []}}
+        response = client.post('/combat/stream', json=empty)
+        assert response.status_code == 400
+        assert response.get_json()['errors'][0]['player'] == 1
+
+        invalid = {**COMBAT, 'player2': {'movements': ['X'], 'attacks': ['']}}
+        response = client.post('/combat/stream', json=invalid, headers={'Accept': 'text/event-stream'})
+        assert response.status_code == 400
+        assert response.get_json()['errors'][0]['move'] == 'X'
+
+
+class TestSessions:
+    def test_play_session(self, client):
+        response = client.post('/sessions', json={'seed': 1})
+        assert response.status_code == 201
+        session_id = response.get_json()['id']
+
+        response = client.post(f"/sessions/{session_id}/turns",
+                               json={'player1': {'movement': 'DSD', 'attack': 'P'}, 'player2': {'movement': 'SA'}})
+        assert response.status_code == 200
+        assert response.get_json()['player2']['health'] == 3
+
+        assert client.get(f"/sessions/{session_id}").get_json()['turns'] == 1
+        assert client.delete(f"/sessions/{session_id}").get_json()['finished'] is True
+        assert client.get(f"/sessions/{session_id}").status_code == 404
+
+    @pytest.mark.parametrize('body', [{'seed': [1]}, {'player1': 'DSD'}, [1]])
+    def test_create_rejects_invalid_bodies(self, client, body):
+        assert client.post('/sessions', json=body).status_code == 400
+
+    def test_turn_rejects_invalid_moves(self, client):
+        session_id = client.post('/sessions', json={}).get_json()['id']
+        path = f"/sessions/{session_id}/turns"
+
+        response = client.post(path, json={'player1': 'DSD', 'player2': {'movement': 'SA'}})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'TypeError: Player 1 must be a dictionary'
+
+        response = client.post(path, json={'player1': {'movement': 'X'}, 'player2': {'movement': 'SA'}})
+        assert response.status_code == 400
+        assert response.get_json()['errors'] == [
+            {'turn': 0, 'player': 1, 'move': 'X', 'reason': 'Movements must be only W, A, S or D characters'},
+        ]
+
+        response = client.post(path, json={'player1': {'movement': 1}, 'player2': {}})
+        assert response.status_code == 400
+        assert client.get(f"/sessions/{session_id}").get_json()['turns'] == 0
+
+
+class TestBatch:
+    def combats(self) -> list[dict]:
+        return [
+            COMBAT,
+            {'player1': {'movements': ['X'], 'attacks': ['']}, 'player2': COMBAT['player2']},
+            {'jugador1': {'movimientos': ['DSD'], 'golpes': ['P']},
+             'jugador2': {'movimientos': [''], 'golpes': ['P']}},
+            {'player1': {'movements': [], 'attacks': []}, 'player2': COMBAT['player2']},
+            {'player1': COMBAT['player1']},
+        ] * 3
+
+    def check_results(self, results: list[dict]) -> None:
+        assert len(results) == 15
+        for index in range(0, 15, 5):
+            assert results[index]['winner'] == 'Arnaldor Shuatseneguer'
+            assert results[index + 1]['errors'][0]['move'] == 'X'
+            assert results[index + 2]['player2']['health'] == 3
+            assert results[index + 3]['errors'][0]['reason'] == 'Moves must be a non empty list'
+            assert results[index + 4]['error'] == "KeyError: 'player2'"
+
+    def test_single_item(self, client):
+        response = client.post('/combat/batch?narration=false', json=[COMBAT])
+        assert response.status_code == 200
+        assert response.get_json()['results'][0]['death_turn'] == 2
+
+    def test_one_worker(self, client, monkeypatch):
+        monkeypatch.setitem(service_app.app.config, 'BATCH_WORKERS', 1)
+        monkeypatch.setattr(service_app, 'get_executor', None)
+        response = client.post('/combat/batch?narration=false', json=self.combats())
+        self.check_results(response.get_json()['results'])
+
+    def test_workers_keep_order(self, client, monkeypatch):
+        monkeypatch.setitem(service_app.app.config, 'BATCH_WORKERS', 2)
+        monkeypatch.setitem(service_app.app.config, 'BATCH_CHUNKSIZE', 2)
+        try:
+            response = client.post('/combat/batch?narration=false', json=self.combats())
+            self.check_results(response.get_json()['results'])
+            assert service_app.get_executor() is service_app.executor
+        finally:
+            service_app.shutdown_executor()
+        assert service_app.executor is None
+
+    def test_workers_combats_are_counted(self, client, monkeypatch):
+        monkeypatch.setitem(service_app.app.config, 'BATCH_WORKERS', 2)
+        monkeypatch.setitem(service_app.app.config, 'BATCH_CHUNKSIZE', 2)
+        metrics.REGISTRY.clear()
+        stats.STATS.clear()
+        metrics.enable()
+        stats.enable()
+        try:
+            response = client.post('/combat/batch?narration=false', json=self.combats())
+            self.check_results(response.get_json()['results'])
+        finally:
+            metrics.disable()
+            stats.disable()
+            service_app.shutdown_executor()
+
+        summary = client.get('/stats').get_json()
+        stats.STATS.clear()
+        assert summary['combats'] == 6
+        assert summary['draws'] == 3
+        assert summary['special_attacks']['Arnaldor Shuatseneguer']['Remuyuken'] == 6
+        assert metrics.TURNS.value() == 12
+        assert metrics.DEATHS.value() == 3
+        assert metrics.DRAWS.value() == 3
+        assert metrics.SPECIAL_ATTACKS.value(character='Tonyn Stallone', attack='Taladoken') == 6
+        metrics.REGISTRY.clear()
+
+    def test_invalid_batches(self, client):
+        assert client.post('/combat/batch', json={'player1': {}}).status_code == 400
+        assert client.post('/combat/batch?locale=xx', json=[COMBAT]).status_code == 400
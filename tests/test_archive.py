@@ -0,0 +1,88 @@
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import archive
+from talanakombat import characters
+
+
+def make_combat(player1moves: list[str], player2moves: list[str], seed=None) -> tk.Combat:
+    return tk.Combat(player1=tk.TonynStallone(),
+                     player2=tk.ArnaldorShuatseneguer(),
+                     player1moves=list(player1moves),
+                     player2moves=list(player2moves),
+                     seed=seed)
+
+
+class TestCodec:
+    def test_move_codes(self):
+        assert len(archive.MOVES) == 3 * len(characters.MOVEMENT_DESCRIPTIONS)
+        assert len(archive.MOVES) == archive.ESCAPE
+        assert archive.MOVES[archive.MOVE_CODES['DSD+P']] == 'DSD+P'
+
+    def test_round_trip(self):
+        combat = make_combat(['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'],
+                             ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'], seed=42)
+        record = archive.encode(combat)
+        assert len(record) == 7 + 8 + 3 * 5
+        assert archive.decode(record) == {
+            'player1': 0,
+            'player2': 1,
+            'seed': 42,
+            'player1moves': ['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'],
+            'player2moves': ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'],
+        }
+
+    def test_round_trip_escaped_moves_and_seeds(self):
+        for seed in (None, 'semilla', -1, 2 ** 62):
+            combat = make_combat(['dsd+p', 'X', ''], ['SA+K'], seed=seed)
+            decoded = archive.decode(archive.encode(combat))
+            assert decoded['seed'] == seed
+            assert decoded['player1moves'] == ['dsd+p', 'X', '']
+            assert decoded['player2moves'] == ['SA+K', '', '']
+
+    def test_encode_invalid(self):
+        with pytest.raises(TypeError):
+            archive.encode(make_combat(['D'], ['S'], seed=1.5))
+
+        combat = tk.Combat(player1=tk.TonynStallone(health=10),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['D'], player2moves=['S'])
+        with pytest.raises(ValueError):
+            archive.encode(combat)
+
+    def test_replay_matches_fight(self):
+        player1moves = ['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P']
+        player2moves = ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P']
+        record = archive.encode(make_combat(player1moves, player2moves, seed=7))
+        expected = list(make_combat(player1moves, player2moves, seed=7).fight())
+        assert list(archive.replay(record).fight()) == expected
+
+
+class TestArchive:
+    def test_append_and_read(self, tmp_path):
+        path = str(tmp_path / 'combats.tkr')
+        combats = [make_combat(['D+K'] * n, ['SA'] * n, seed=n) for n in range(1, 20)]
+
+        with archive.Archive(path) as archived:
+            assert len(archived) == 0
+            for n, combat in enumerate(combats):
+                assert archived.append(combat) == n
+            # Records appended after a read are found too.
+            assert archived.get(3)['seed'] == 4
+            archived.append(make_combat(['P'], ['K'], seed='last'))
+            assert archived.get(19)['seed'] == 'last'
+
+        with archive.Archive(path) as archived:
+            assert len(archived) == 20
+            assert archived.get(0)['player1moves'] == ['D+K']
+            assert [record['seed'] for record in archived][:3] == [1, 2, 3]
+            assert list(archived.replay(5).fight()) == list(
+                make_combat(['D+K'] * 6, ['SA'] * 6, seed=6).fight())
+            with pytest.raises(KeyError):
+                archived.read(20)
+
+    def test_not_an_archive(self, tmp_path):
+        path = tmp_path / 'combats.jsonl'
+        path.write_text('{}\n')
+        with pytest.raises(ValueError):
+            archive.Archive(str(path))
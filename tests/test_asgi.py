@@ -0,0 +1,100 @@
+import asyncio
+import concurrent.futures
+import json
+import pickle
+import threading
+
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import exceptions
+from talanakombat import service
+import asgi
+
+COMBAT = {
+    'player1': {'movements': ['D', 'DSD', 'S', 'DSD', 'SD'], 'attacks': ['K', 'P', '', 'K', 'P']},
+    'player2': {'movements': ['SA', 'SA', 'SA', 'ASA', 'SA'], 'attacks': ['K', '', 'K', 'P', 'P']},
+}
+
+
+def request(body: bytes, path: str = '/combat', method: str = 'POST', query: bytes = b'') -> tuple[int, dict]:
+    scope = {'type': 'http', 'path': path, 'method': method, 'query_string': query}
+    messages = [{'type': 'http.request', 'body': body[:10], 'more_body': True},
+                {'type': 'http.request', 'body': body[10:], 'more_body': False}]
+    response = {}
+
+    async def receive() -> dict:
+        return messages.pop(0)
+
+    async def send(message: dict) -> None:
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        else:
+            response['body'] = json.loads(message['body'])
+
+    asyncio.run(asgi.app(scope, receive, send))
+    return response['status'], response['body']
+
+
+@pytest.fixture
+def threaded_executor(monkeypatch):
+    # Threads stand in for the worker processes, so the test can see where
+    # each combat was prepared.
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(asgi, 'executor', executor)
+    threads = []
+    prepare = service.prepare
+
+    def recording_prepare(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return prepare(*args, **kwargs)
+
+    monkeypatch.setattr(service, 'prepare', recording_prepare)
+    yield threads
+    executor.shutdown()
+
+
+class TestASGI:
+    def test_combat(self):
+        status, body = request(json.dumps(COMBAT).encode(), query=b'narration=false')
+        assert status == 200
+        assert body['winner'] == 'Arnaldor Shuatseneguer'
+        assert body['death_turn'] == 2
+
+    def test_errors(self):
+        assert request(b'{')[0] == 400
+        assert request(b'{}', path='/other')[0] == 404
+        assert request(b'{}', method='GET')[0] == 405
+        assert request(json.dumps(COMBAT).encode(), query=b'locale=xx')[0] == 400
+
+        status, body = request(json.dumps({**COMBAT, 'player1': {'movements': ['X'], 'attacks': ['']}}).encode())
+        assert status == 400
+        assert body['errors'][0]['move'] == 'X'
+
+    def test_request_turns(self):
+        assert asgi.request_turns(COMBAT) == 5
+        assert asgi.request_turns({'jugador1': {'movimientos': ['D'] * 3, 'golpes': []},
+                                   'jugador2': {'movimientos': [], 'golpes': []}}) == 3
+        assert asgi.request_turns({'player1': {}}) == 0
+        assert asgi.request_turns([]) == 0
+
+    def test_short_combats_run_on_the_loop(self, threaded_executor):
+        assert request(json.dumps(COMBAT).encode())[0] == 200
+        assert threaded_executor == [threading.main_thread()]
+
+    def test_long_combats_are_only_prepared_in_workers(self, threaded_executor, monkeypatch):
+        monkeypatch.setattr(asgi, 'OFFLOAD_THRESHOLD', 4)
+        assert request(json.dumps(COMBAT).encode())[0] == 200
+        assert len(threaded_executor) == 1
+        assert threaded_executor[0] is not threading.main_thread()
+
+        invalid = {**COMBAT, 'player2': {'movements': ['X'] * 5, 'attacks': [''] * 5}}
+        status, body = request(json.dumps(invalid).encode())
+        assert status == 400
+        assert len(body['errors']) == 5
+
+    def test_invalid_moves_exception_pickles(self):
+        error = exceptions.InvalidMovesException('Invalid', [{'turn': 0}])
+        copied = pickle.loads(pickle.dumps(error))
+        assert str(copied) == 'Invalid'
+        assert copied.errors == [{'turn': 0}]
@@ -0,0 +1,76 @@
+import pytest
+
+from .context import talanakombat as tk
+
+np = pytest.importorskip('numpy')
+batch = pytest.importorskip('talanakombat.batch')
+
+
+class TestBatchCombat:
+    def test_init_default_players(self):
+        engine = batch.BatchCombat()
+        assert engine.player1.name == 'Tonyn Stallone'
+        assert engine.player2.name == 'Arnaldor Shuatseneguer'
+
+    def test_init_wrong_player_type(self):
+        with pytest.raises(TypeError) as e:
+            batch.BatchCombat(player1='TonynStallone')
+            assert e.message == 'Player 1 must be a characters.BaseCharacter'
+
+    def test_encode_move(self):
+        assert batch.BatchCombat.encode_move(
+            tk.TonynStallone(), 'DSD+P') == ((5 << 16) | 3, 3)
+        assert batch.BatchCombat.encode_move(
+            tk.TonynStallone(), 'S') == ((1 << 16) | 1, 0)
+
+    def test_encode_invalid_move(self):
+        with pytest.raises(ValueError):
+            batch.BatchCombat().encode([(['DSX+P'], ['SA'])])
+
+    def test_encode_match_without_moves(self):
+        with pytest.raises(ValueError):
+            batch.BatchCombat().encode([([], ['SA'])])
+
+    def test_fight_matches_combat(self):
+        matches = [
+            (['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'],
+             ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P']),
+            (['DAD+P', 'S'],
+             ['P', 'ASA', 'DA+P', 'AAA+K', 'K', 'SA+K']),
+            (['SDD+K', 'DSD+P', 'SA+K', 'DSD+P'],
+             ['DSD+P', 'WSAW+K', 'AS+K', 'K', 'ASA+P', 'SA+K']),
+            (['W', 'A'], ['S']),
+        ]
+        result = batch.BatchCombat().fight(matches)
+
+        assert result['winner'].tolist() == [2, 2, 1, 0]
+        assert result['player1_health'].tolist() == [0, 0, 2, 6]
+        assert result['player2_health'].tolist() == [2, 5, 0, 6]
+        assert result['death_turn'].tolist() == [2, 5, 3, -1]
+
+        for (player1moves, player2moves), winner in zip(matches, result['winner']):
+            player1 = tk.TonynStallone()
+            player2 = tk.ArnaldorShuatseneguer()
+            combat = tk.Combat(player1=player1, player2=player2,
+                               player1moves=list(player1moves),
+                               player2moves=list(player2moves))
+            list(combat.fight())
+            if winner == 1:
+                assert player1.is_alive() and not player2.is_alive()
+            elif winner == 2:
+                assert player2.is_alive() and not player1.is_alive()
+            else:
+                assert player1.is_alive() and player2.is_alive()
+
+    def test_fight_killing_blow_goes_to_first_player(self):
+        player1 = tk.BaseCharacter(
+            name='One', health=1, special_attacks={'P': {'name': 'Punch', 'damage': 1}})
+        player2 = tk.BaseCharacter(
+            name='Two', health=1, special_attacks={'P': {'name': 'Punch', 'damage': 1}})
+        result = batch.BatchCombat(player1=player1, player2=player2).fight([
+            (['P'], ['P']),
+            (['W+P'], ['P']),
+        ])
+        assert result['winner'].tolist() == [1, 2]
+        assert result['player1_health'].tolist() == [1, 0]
+        assert result['player2_health'].tolist() == [0, 1]
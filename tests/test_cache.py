@@ -0,0 +1,63 @@
+import pytest
+
+from .context import talanakombat
+from talanakombat import cache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUCache:
+    def test_init_max_size_not_integer(self):
+        with pytest.raises(TypeError):
+            cache.LRUCache(max_size='1')
+
+    def test_init_max_size_zero(self):
+        with pytest.raises(ValueError):
+            cache.LRUCache(max_size=0)
+
+    def test_init_ttl_zero(self):
+        with pytest.raises(ValueError):
+            cache.LRUCache(ttl=0)
+
+    def test_get_and_put(self):
+        lru = cache.LRUCache()
+        assert lru.get('a') is None
+        lru.put('a', 1)
+        assert lru.get('a') == 1
+        assert lru.stats()['hits'] == 1
+        assert lru.stats()['misses'] == 1
+
+    def test_evicts_least_recently_used(self):
+        lru = cache.LRUCache(max_size=2)
+        lru.put('a', 1)
+        lru.put('b', 2)
+        lru.get('a')
+        lru.put('c', 3)
+        assert lru.get('b') is None
+        assert lru.get('a') == 1
+        assert lru.get('c') == 3
+        assert len(lru) == 2
+        assert lru.stats()['evictions'] == 1
+
+    def test_expires_after_ttl(self):
+        clock = FakeClock()
+        lru = cache.LRUCache(ttl=10, clock=clock)
+        lru.put('a', 1)
+        clock.now = 9.9
+        assert lru.get('a') == 1
+        clock.now = 10
+        assert lru.get('a') is None
+        assert len(lru) == 0
+        assert lru.stats()['expirations'] == 1
+
+    def test_pop(self):
+        lru = cache.LRUCache()
+        lru.put('a', 1)
+        assert lru.pop('a') == 1
+        assert lru.pop('a', 2) == 2
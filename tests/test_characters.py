@@ -123,6 +123,13 @@ class TestBaseCharacter:
             character.receive_damage(10)
             assert e.value == 'Test is dead'
 
+    def test_base_character_apply_damage(self):
+        character = tk.BaseCharacter(
+            name='Test', health=2, special_attacks={'P': {'name': 'Punch', 'damage': 1}})
+        assert character.apply_damage(1) == True
+        assert character.apply_damage(5) == False
+        assert character.health == 0
+
     def test_base_character_move_is_special_attack(self):
         character = tk.BaseCharacter(
             name='Test', health=100, special_attacks={'DSD+P': {'name': 'Taladoken', 'damage': 3}})
@@ -135,6 +142,31 @@ class TestBaseCharacter:
         assert character.is_special_attack(
             'DDS') == ('DDS', None)
 
+    def test_base_character_move_special_attack_first_declared_wins(self):
+        character = tk.BaseCharacter(
+            name='Test', health=100, special_attacks={
+                'P': {'name': 'Punch', 'damage': 1},
+                'DSD+P': {'name': 'Taladoken', 'damage': 3},
+            })
+        assert character.is_special_attack(
+            'DSD+P') == ('DSD', {'name': 'Punch', 'damage': 1})
+
+    def test_base_character_move_special_attack_longest_when_declared_first(self):
+        character = tk.TonynStallone()
+        assert character.is_special_attack(
+            'WDSD+P') == ('W', {'name': 'Taladoken', 'damage': 3})
+        assert character.is_special_attack(
+            'SD+P') == ('SD', {'name': 'Punch', 'damage': 1})
+        assert character.is_special_attack(
+            'SD+K') == ('', {'name': 'Remuyuken', 'damage': 2})
+
+    def test_base_character_move_special_attack_inside_the_play(self):
+        character = tk.TonynStallone()
+        assert character.is_special_attack(
+            'DSD+PP') == ('D', {'name': 'Taladoken', 'damage': 3})
+        assert character.is_special_attack(
+            'SD+KW') == ('S', {'name': 'Remuyuken', 'damage': 2})
+
     def test_base_character_describes_movement_non_string(self):
         character = tk.BaseCharacter(
             name='Test', health=100, special_attacks={'DSD+P': {'name': 'Taladoken', 'damage': 3}})
@@ -173,12 +205,34 @@ class TestBaseCharacter:
         assert character.describe_movement(
             'DSD') == ' moved right, down and right'
 
+    def test_base_character_describes_lowercase_movements(self):
+        assert tk.BaseCharacter.describe_movement(
+            'dSd') == ' moved right, down and right'
+
+    def test_base_character_describes_every_valid_movement(self):
+        assert len(tk.characters.MOVEMENT_DESCRIPTIONS) == 1365
+        assert tk.characters.MOVEMENT_DESCRIPTIONS[''] == ' did not move'
+        assert tk.characters.MOVEMENT_DESCRIPTIONS['WASDW'] == ' moved up, left, down, right and up'
+
     def test_base_character_describes_special_attack(self):
         character = tk.BaseCharacter(
             name='Test', health=100, special_attacks={'DSD+P': {'name': 'Taladoken', 'damage': 3}})
         assert re.search(' ([a-z]+) a Taladoken attack',
                          character.describe_special_attack({'name': 'Taladoken'}))
 
+    def test_base_character_move_damage(self):
+        character = tk.BaseCharacter(
+            name='Test', health=100, special_attacks={'DSD+P': {'name': 'Taladoken', 'damage': 3}})
+        assert character.move_damage('') == 0
+        assert character.move_damage('DS') == 0
+        assert character.move_damage('DDSD+P') == 3
+
+    def test_base_character_move_damage_invalid_movement(self):
+        character = tk.BaseCharacter(
+            name='Test', health=100, special_attacks={'DSD+P': {'name': 'Taladoken', 'damage': 3}})
+        with pytest.raises(ValueError):
+            character.move_damage('XDSD+P')
+
     def test_base_character_makes_move_did_nothing(self):
         character = tk.BaseCharacter(
             name='Test', health=100, special_attacks={'DSD+P': {'name': 'Taladoken', 'damage': 3}})
@@ -291,3 +345,51 @@ class TestArnaldorShuatseneguer:
         character = tk.ArnaldorShuatseneguer()
         assert character.special_attacks['K']['name'] == 'Kick'
         assert character.special_attacks['K']['damage'] == 1
+
+
+class TestCharacterTemplate:
+    def test_template_is_validated(self):
+        with pytest.raises(ValueError):
+            tk.CharacterTemplate('Test', 0, {'P': {'name': 'Punch', 'damage': 1}})
+
+    def test_template_special_attacks_are_read_only(self):
+        special_attacks = {'P': {'name': 'Punch', 'damage': 1}}
+        template = tk.CharacterTemplate('Test', 1, special_attacks)
+        special_attacks['P']['damage'] = 10
+        assert template.special_attacks['P']['damage'] == 1
+        with pytest.raises(TypeError):
+            template.special_attacks['P']['damage'] = 10
+
+    def test_characters_share_default_template(self):
+        assert tk.TonynStallone().template is tk.TonynStallone().template
+        assert tk.ArnaldorShuatseneguer().template is tk.ArnaldorShuatseneguer.TEMPLATE
+
+    def test_character_from_template_has_own_health(self):
+        first = tk.BaseCharacter.from_template(tk.TonynStallone.TEMPLATE)
+        second = tk.BaseCharacter.from_template(tk.TonynStallone.TEMPLATE)
+        first.apply_damage(2)
+        assert first.health == 4
+        assert second.health == 6
+        assert first.name == 'Tonyn Stallone'
+
+    def test_character_from_template_wrong_type(self):
+        with pytest.raises(TypeError):
+            tk.BaseCharacter.from_template({'name': 'Test'})
+
+    def test_character_overrides_default_template(self):
+        character = tk.TonynStallone(health=10)
+        assert character.health == 10
+        assert character.template is not tk.TonynStallone.TEMPLATE
+        assert character.special_attacks == tk.TonynStallone.TEMPLATE.special_attacks
+
+    def test_character_from_special_attacks_of_another(self):
+        special_attacks = tk.TonynStallone().special_attacks
+        clone = tk.BaseCharacter('Clone', 5, special_attacks)
+        assert clone.special_attacks == special_attacks
+        character = tk.ArnaldorShuatseneguer(special_attacks=special_attacks)
+        assert character.special_attacks == special_attacks
+        assert character.template.to_dict()['special_attacks'] == tk.TonynStallone.TEMPLATE.to_dict()['special_attacks']
+
+    def test_characters_have_no_instance_dict(self):
+        with pytest.raises(AttributeError):
+            tk.TonynStallone().nickname = 'Tonyn'
@@ -1,4 +1,5 @@
 import pytest
+import itertools
 import re
 
 from .context import talanakombat as tk
@@ -136,3 +137,103 @@ class TestCombat:
 
         assert combat.player1.health == 2
         assert combat.player2.health == 0
+
+    def test_combat_resolve_cant_start_without_moves(self):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer())
+        with pytest.raises(AttributeError):
+            combat.resolve()
+
+    def test_combat_resolve_arnaldor_wins(self):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'],
+                           player2moves=['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'])
+        assert combat.resolve() == {
+            'winner': combat.player2,
+            'player1_health': 0,
+            'player2_health': 2,
+            'death_turn': 2,
+        }
+
+    def test_combat_resolve_tonyn_wins(self):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['SDD+K', 'DSD+P', 'SA+K', 'DSD+P'],
+                           player2moves=['DSD+P', 'WSAW+K', 'AS+K', 'K', 'ASA+P', 'SA+K'])
+        assert combat.resolve() == {
+            'winner': combat.player1,
+            'player1_health': 2,
+            'player2_health': 0,
+            'death_turn': 3,
+        }
+
+    def test_combat_resolve_draw(self):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['W', 'A+K'],
+                           player2moves=['S'])
+        assert combat.resolve() == {
+            'winner': None,
+            'player1_health': 6,
+            'player2_health': 5,
+            'death_turn': None,
+        }
+
+    def test_combat_resolve_invalid_move(self):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['W', 'X+K'],
+                           player2moves=['S'])
+        with pytest.raises(ValueError):
+            combat.resolve()
+
+    def test_combat_seed_makes_narration_reproducible(self):
+        def narration(seed):
+            combat = tk.Combat(player1=tk.TonynStallone(),
+                               player2=tk.ArnaldorShuatseneguer(),
+                               player1moves=['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'],
+                               player2moves=['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'],
+                               seed=seed)
+            assert combat.seed == seed
+            return list(combat.fight())
+
+        assert narration(42) == narration(42)
+
+    def test_combat_without_seed_uses_shared_generator(self):
+        import random
+        assert tk.Combat().rng is random
+        assert tk.Combat(seed=1).rng is not random
+
+    def test_combat_set_moves_does_not_change_lists(self):
+        player1moves = ['D+K', 'DSD+P', 'S']
+        player2moves = ['SA+K']
+        combat = tk.Combat().set_moves(player1moves, player2moves)
+        assert combat.player2moves == ['SA+K', '', '']
+        assert player1moves == ['D+K', 'DSD+P', 'S']
+        assert player2moves == ['SA+K']
+
+    def test_combat_streamed_moves_match_lists(self):
+        player1moves = ['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P']
+        player2moves = ['SA+K', 'SA', 'SA+K']
+
+        def narration(moves1, moves2):
+            return list(tk.Combat(player1=tk.TonynStallone(),
+                                  player2=tk.ArnaldorShuatseneguer(),
+                                  player1moves=moves1, player2moves=moves2,
+                                  seed=3).fight())
+
+        assert narration(iter(player1moves), (move for move in player2moves)) == \
+            narration(player1moves, player2moves)
+        assert narration(tuple(player1moves), player2moves) == \
+            narration(player1moves, player2moves)
+
+    def test_combat_endless_moves(self):
+        # Neither stream ends, so the combat only stops when someone dies.
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=itertools.repeat('W'),
+                           player2moves=itertools.cycle(['SA+K', 'S']))
+        result = combat.resolve()
+        assert result['winner'] is combat.player2
+        assert result['death_turn'] == 2
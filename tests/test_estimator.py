@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import exceptions
+
+np = pytest.importorskip('numpy')
+estimator = pytest.importorskip('talanakombat.estimator')
+
+
+class TestEstimator:
+    def test_move_set(self):
+        moves = estimator.move_set(tk.TonynStallone())
+        assert len(moves) == 3 * len(tk.characters.MOVEMENTS)
+        assert {'', 'P', 'K', 'DSD+P', 'SD+K', 'WWWWW+K'} <= set(moves)
+
+    def test_invalid_distribution(self):
+        with pytest.raises(ValueError):
+            estimator.Estimator(player1distribution={'X': 1})
+        with pytest.raises(ValueError):
+            estimator.Estimator(player1distribution={'P': 0})
+
+    def test_decided_match_is_exact(self):
+        result = estimator.Estimator(workers=1).estimate(
+            ['D+K', 'DSD+P', 'S'], ['SA+K', 'SA', 'SA+K'], 10)
+        assert result['samples'] == 0
+        assert result['player2_win'] == 1
+        assert result['intervals']['player2_win'] == (1, 1)
+        assert result['player1_health'] == 0
+
+    def test_completes_from_current_health(self):
+        # After the known turns Arnaldor has 2 health left, and Tonyn only
+        # punches while Arnaldor stands still: 2 more turns win, 1 draws.
+        engine = estimator.Estimator(player1distribution={'P': 1},
+                                     player2distribution={'': 1}, workers=1)
+        assert engine.estimate(['D+K', 'DSD+P'], ['SA', ''], 4)['player1_win'] == 1
+        assert engine.estimate(['D+K', 'DSD+P'], ['SA', ''], 3)['draw'] == 1
+
+    def test_matches_combat_simulation(self):
+        distribution = {'': 1, 'P': 2, 'K': 2, 'SD+K': 1, 'DSD+P': 1}
+        moves = list(distribution)
+        weights = list(distribution.values())
+        rng = random.Random(0)
+        wins = 0
+        for _ in range(4000):
+            combat = tk.Combat(player1=tk.TonynStallone(),
+                               player2=tk.TonynStallone(),
+                               player1moves=rng.choices(moves, weights, k=6),
+                               player2moves=rng.choices(moves, weights, k=6))
+            wins += combat.resolve()['winner'] is combat.player1
+
+        result = estimator.Estimator(player1=tk.TonynStallone(), player2=tk.TonynStallone(),
+                                     player1distribution=distribution, player2distribution=distribution,
+                                     workers=1, seed=0, tolerance=0.005).estimate([], [], 6)
+        assert result['converged']
+        assert abs(result['player1_win'] - wins / 4000) < 0.03
+        assert result['intervals']['player1_win'][0] <= result['player1_win'] <= result['intervals']['player1_win'][1]
+
+    def test_early_stopping_and_workers(self):
+        engine = estimator.Estimator(workers=2, batch_size=1000, tolerance=0.05, seed=1)
+        result = engine.estimate(['D'], ['S'], 8)
+        assert result['converged']
+        assert result['samples'] < 10000
+        assert abs(result['player1_win'] + result['player2_win'] + result['draw'] - 1) < 1e-9
+
+    def test_invalid_known_moves(self):
+        with pytest.raises(exceptions.InvalidMovesException):
+            estimator.Estimator(workers=1).estimate(['X'], ['S'], 5)
+        with pytest.raises(ValueError):
+            estimator.Estimator(workers=1).estimate(['D', 'S'], ['S'], 1)
@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import characters
+from talanakombat import events
+from talanakombat import session
+
+
+def legacy_fight(player1moves: list[str], player2moves: list[str], seed: int) -> list[str]:
+    # The narration as it was built before events existed, move by move with
+    # make_move and receive_damage.
+    rng = random.Random(seed)
+    combat = tk.Combat(player1=tk.TonynStallone(),
+                       player2=tk.ArnaldorShuatseneguer(),
+                       player1moves=player1moves,
+                       player2moves=player2moves)
+    narration = []
+    for p1, p2 in zip(combat.player1moves, combat.player2moves):
+        first, second, p1, p2 = combat.decide_order(p1, p2)
+        try:
+            description, damage = first.make_move(p1, rng)
+            narration.append(description)
+            second.receive_damage(damage)
+            description, damage = second.make_move(p2, rng)
+            narration.append(description)
+            first.receive_damage(damage)
+        except tk.DeadPlayerException as e:
+            narration.append(str(e))
+            break
+    narration.append(combat.describe_outcome())
+    return narration
+
+
+class TestEvents:
+    def test_english_movement_table(self):
+        assert events.movement_table('en') is characters.MOVEMENT_DESCRIPTIONS
+        for movement, description in characters.MOVEMENT_DESCRIPTIONS.items():
+            assert events.render_movement(movement, 'en') == description
+
+    def test_spanish_movement_table(self):
+        table = events.movement_table('es')
+        assert len(table) == len(characters.MOVEMENT_DESCRIPTIONS)
+        assert table[''] == ' no se movió'
+        assert table['S'] == ' se movió abajo'
+        assert table['DSD'] == ' se movió a la derecha, abajo y a la derecha'
+
+    def test_unknown_locale(self):
+        with pytest.raises(ValueError) as e:
+            events.render(events.Outcome(None, None), 'fr')
+        assert str(e.value) == 'Locale must be one of en, es'
+
+    def test_fight_matches_legacy_narration(self):
+        moves = ['', 'D', 'S', 'DSD+P', 'SD+K', 'P', 'K', 'SA+K', 'ASA+P', 'SA', 'WWW', 'dsd', 'D+K']
+        rng = random.Random(0)
+        for seed in range(300):
+            player1moves = [rng.choice(moves) for _ in range(rng.randint(1, 10))]
+            player2moves = [rng.choice(moves) for _ in range(rng.randint(1, 10))]
+            combat = tk.Combat(player1=tk.TonynStallone(),
+                               player2=tk.ArnaldorShuatseneguer(),
+                               player1moves=list(player1moves),
+                               player2moves=list(player2moves),
+                               seed=seed)
+            assert list(combat.fight()) == legacy_fight(player1moves, player2moves, seed)
+
+    def test_fight_events(self):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['DSD+P', ''],
+                           player2moves=['SA+K', 'SA+K'],
+                           seed=1)
+        log = list(combat.fight_events())
+        assert log[0] == events.Move('Arnaldor Shuatseneguer', 'Tonyn Stallone', '', 'Remuyuken', log[0].verb, 3, 3)
+        assert log[1] == events.Move('Tonyn Stallone', 'Arnaldor Shuatseneguer', '', 'Taladoken', log[1].verb, 3, 3)
+        assert log[2] == events.Move('Tonyn Stallone', 'Arnaldor Shuatseneguer', '', None, None, 0, 3)
+        assert log[3] == events.Move('Arnaldor Shuatseneguer', 'Tonyn Stallone', '', 'Remuyuken', log[3].verb, 3, 0)
+        assert log[4] == events.Death('Tonyn Stallone')
+        assert log[5] == events.Outcome('Arnaldor Shuatseneguer', 3)
+        assert events.to_dict(log[5]) == {'event': 'outcome', 'winner': 'Arnaldor Shuatseneguer', 'health': 3}
+
+    def test_render_events(self):
+        move = events.Move('Tonyn Stallone', 'Arnaldor Shuatseneguer', 'DS', 'Taladoken', 2, 3, 3)
+        assert events.render(move) == 'Tonyn Stallone moved right and down, and hit a Taladoken attack'
+        assert events.render(move, 'es') == 'Tonyn Stallone se movió a la derecha y abajo, y lanzó un ataque Taladoken'
+
+        still = events.Move('Tonyn Stallone', 'Arnaldor Shuatseneguer', '', None, None, 0, 6)
+        assert events.render(still) == 'Tonyn Stallone did nothing'
+        assert events.render(still, 'es') == 'Tonyn Stallone no hizo nada'
+
+        assert events.render(events.Death('Tonyn Stallone'), 'es') == 'Tonyn Stallone ha muerto'
+        assert events.render(events.Outcome('Tonyn Stallone', 2), 'es') == 'Tonyn Stallone es el ganador y tiene 2 de vida'
+        assert events.render(events.Outcome(None, None), 'es') == 'El combate terminó en empate'
+
+    def test_fight_locales_share_the_seed(self):
+        def fight(locale: str) -> list[str]:
+            return list(tk.Combat(player1=tk.TonynStallone(),
+                                  player2=tk.ArnaldorShuatseneguer(),
+                                  player1moves=['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'],
+                                  player2moves=['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'],
+                                  seed=7).fight(locale))
+
+        english = fight('en')
+        spanish = fight('es')
+        assert len(english) == len(spanish)
+        assert spanish[-1] == 'Arnaldor Shuatseneguer es el ganador y tiene 2 de vida'
+        assert english[-1] == 'Arnaldor Shuatseneguer is the winner and has 2 health'
+
+    def test_session_locale(self):
+        live = session.Session(seed=1, locale='es')
+        assert live.play_turn('', '')['narration'] == [
+            'Tonyn Stallone no hizo nada',
+            'Arnaldor Shuatseneguer no hizo nada',
+        ]
+
+        with pytest.raises(ValueError):
+            session.Session(locale='fr')
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules a cold start must not load unless the code that needs them runs.
+HEAVY = ('flask', 'random', 're', 'typing', 'concurrent.futures')
+
+
+def imported_by(code: str) -> set[str]:
+    # Runs the code in a fresh interpreter and returns the modules it imported,
+    # leaving out whatever the interpreter had already loaded on startup.
+    script = (
+        'import sys\n'
+        'before = set(sys.modules)\n'
+        f"{code}\n"
+        'after = set(sys.modules)\n'
+        'import json\n'
+        'print(json.dumps(sorted(after - before)))\n'
+    )
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return set(json.loads(output.splitlines()[-1]))
+
+
+COMBAT = (
+    "combat = tk.Combat(player1=tk.TonynStallone(), player2=tk.ArnaldorShuatseneguer(), "
+    "player1moves=['D+K', 'DSD+P', 'S'], player2moves=['SA+K', 'SA', 'ASA+P'])"
+)
+
+
+class TestImports:
+    def test_import_package_is_lazy(self):
+        modules = imported_by('import talanakombat')
+        assert 'talanakombat.characters' not in modules
+        assert 'talanakombat.combat' not in modules
+
+    def test_resolve_without_heavy_modules(self):
+        modules = imported_by(f"import talanakombat as tk\n{COMBAT}\ncombat.resolve()")
+        assert 'talanakombat.combat' in modules
+        assert not modules.intersection(HEAVY)
+
+    def test_service_without_narration(self):
+        modules = imported_by(
+            'from talanakombat import service\n'
+            "service.play({'player1': {'movements': ['D'], 'attacks': ['K']}, "
+            "'player2': {'movements': ['S'], 'attacks': ['P']}}, narration=False)")
+        assert not modules.intersection(HEAVY)
+
+    def test_narration_loads_random(self):
+        modules = imported_by(f"import talanakombat as tk\n{COMBAT}\nlist(combat.fight())")
+        assert 'random' in modules
+        assert 'flask' not in modules
+
+    def test_sessions_do_not_load_typing(self):
+        modules = imported_by('from talanakombat import session\nsession.SessionStore().create()')
+        assert 'talanakombat.session' in modules
+        assert 'typing' not in modules
@@ -0,0 +1,47 @@
+import io
+import json
+
+from .context import talanakombat as tk
+from talanakombat import __main__ as cli
+
+COMBAT = {
+    'player1': {
+        'movements': ['D', 'DSD', 'S', 'DSD', 'SD'],
+        'attacks': ['K', 'P', '', 'K', 'P'],
+    },
+    'jugador2': {
+        'movimientos': ['SA', 'SA', 'SA', 'ASA', 'SA'],
+        'golpes': ['K', '', 'K', 'P', 'P'],
+    },
+}
+
+
+def replay(lines, **kwargs):
+    output = io.StringIO()
+    total = cli.replay(io.StringIO('\n'.join(lines) + '\n'), output, **kwargs)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert total == len(results)
+    return results
+
+
+class TestReplay:
+    def test_replay_inline(self):
+        results = replay([json.dumps(COMBAT), '', json.dumps(COMBAT)],
+                         workers=1, narration=False)
+        assert len(results) == 2
+        assert results[0]['winner'] == 'Arnaldor Shuatseneguer'
+        assert results[0]['death_turn'] == 2
+        assert 'narration' not in results[0]
+
+    def test_replay_errors_per_line(self):
+        results = replay(['not json', '{"x": 1}', json.dumps(COMBAT)], workers=1)
+        assert results[0]['error'].startswith('JSONDecodeError')
+        assert results[1] == {'error': "KeyError: 'player1'"}
+        assert len(results[2]['narration']) == 8
+
+    def test_replay_in_process_pool_keeps_order(self):
+        lines = [json.dumps(COMBAT) if i % 3 else '{}' for i in range(50)]
+        results = replay(lines, workers=2, chunksize=3, max_in_flight=2,
+                         narration=False)
+        assert [('error' in result) for result in results] == [
+            i % 3 == 0 for i in range(50)]
@@ -0,0 +1,82 @@
+import itertools
+
+from .context import talanakombat as tk
+from talanakombat import characters
+from talanakombat import matchup
+
+
+def legacy_player1_first(player1move: str, player2move: str) -> bool:
+    try:
+        if len(player1move) < len(player2move):
+            return True
+        elif len(player1move) > len(player2move):
+            return False
+        elif len(player1move.split('+')[0]) < len(player2move.split('+')[0]):
+            return True
+        elif len(player1move.split('+')[0]) > len(player2move.split('+')[0]):
+            return False
+        elif len(player1move.split('+')[1]) < len(player2move.split('+')[1]):
+            return True
+        elif len(player1move.split('+')[1]) > len(player2move.split('+')[1]):
+            return False
+        return True
+    except IndexError:
+        return True
+
+
+class TestMatchup:
+    def test_player1_first_matches_legacy_order(self):
+        moves = ['', 'P', 'K', 'D', 'DS', 'D+K', 'DSD+P', 'SD+K', 'ASA+P', 'SA+K', 'DSDS', 'D+KP', 'DS+P', 'D+', '+K', 'A+B+C']
+        for player1move, player2move in itertools.product(moves, repeat=2):
+            assert matchup.player1_first(player1move, player2move) == legacy_player1_first(player1move, player2move)
+
+    def test_turns_are_cached(self):
+        pairing = matchup.Matchup(tk.TonynStallone.TEMPLATE, tk.ArnaldorShuatseneguer.TEMPLATE)
+        turn = pairing.turn('DSD+P', 'SA+K')
+        assert turn == (False, (3, '', 'Taladoken'), (3, '', 'Remuyuken'))
+        assert pairing.turns[('DSD+P', 'SA+K')] is turn
+        assert pairing.turn('DSD+P', 'SA+K') is turn
+        assert pairing.turn('dsd', 'S') == (False, (0, 'DSD', None), (0, 'S', None))
+
+    def test_invalid_moves_are_not_cached(self):
+        pairing = matchup.Matchup(tk.TonynStallone.TEMPLATE, tk.ArnaldorShuatseneguer.TEMPLATE)
+        assert pairing.turn('X', 'SA+K') is None
+        assert pairing.turn('D', ['S']) is None
+        assert len(pairing) == 0
+
+    def test_max_size_evicts_least_recently_used(self):
+        pairing = matchup.Matchup(tk.TonynStallone.TEMPLATE, tk.ArnaldorShuatseneguer.TEMPLATE, max_size=2)
+        pairing.turn('D', 'P')
+        pairing.turn('S', 'P')
+        pairing.turn('D', 'P')
+        pairing.turn('A', 'P')
+        assert list(pairing.turns) == [('D', 'P'), ('A', 'P')]
+
+    def test_get_caches_by_template_pair(self):
+        matchup.clear()
+        pairing = matchup.get(tk.TonynStallone.TEMPLATE, tk.ArnaldorShuatseneguer.TEMPLATE)
+        assert matchup.get(tk.TonynStallone.TEMPLATE, tk.ArnaldorShuatseneguer.TEMPLATE) is pairing
+        assert matchup.get(tk.ArnaldorShuatseneguer.TEMPLATE, tk.TonynStallone.TEMPLATE) is not pairing
+
+        # A changed character gets a new template, and so its own table.
+        stronger = tk.TonynStallone(special_attacks={'P': {'name': 'Punch', 'damage': 6}})
+        assert matchup.get(stronger.template, tk.ArnaldorShuatseneguer.TEMPLATE) is not pairing
+
+        # Health doesn't change what a move does, so it shares the table.
+        healthier = tk.TonynStallone(health=60)
+        assert matchup.get(healthier.template, tk.ArnaldorShuatseneguer.TEMPLATE) is pairing
+
+        matchup.clear()
+        assert matchup.get(tk.TonynStallone.TEMPLATE, tk.ArnaldorShuatseneguer.TEMPLATE) is not pairing
+
+    def test_resolve_uses_the_character_templates(self):
+        player1 = tk.TonynStallone(special_attacks={'P': {'name': 'Punch', 'damage': 6}})
+        combat = tk.Combat(player1=player1,
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['P'],
+                           player2moves=['K'])
+        assert combat.resolve()['winner'] is player1
+        assert tk.Combat(player1=tk.TonynStallone(),
+                         player2=tk.ArnaldorShuatseneguer(),
+                         player1moves=['P'],
+                         player2moves=['K']).resolve()['winner'] is None
@@ -0,0 +1,107 @@
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import metrics
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.REGISTRY.clear()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.REGISTRY.clear()
+
+
+class TestMetrics:
+    def test_counter_render(self):
+        counter = metrics.Counter('test_total', 'Test counter')
+        counter.inc(character='A "quoted" name')
+        counter.inc(2, character='A "quoted" name')
+        assert counter.render() == '\n'.join([
+            '# HELP test_total Test counter',
+            '# TYPE test_total counter',
+            'test_total{character="A \\"quoted\\" name"} 3',
+        ])
+
+    def test_histogram_render(self):
+        histogram = metrics.Histogram('test_seconds', 'Test', buckets=[0.1, 1])
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+        assert histogram.render().splitlines()[2:] == [
+            'test_seconds_bucket{le="0.1"} 1',
+            'test_seconds_bucket{le="1"} 2',
+            'test_seconds_bucket{le="+Inf"} 3',
+            'test_seconds_sum 5.55',
+            'test_seconds_count 3',
+        ]
+
+    def test_timer_disabled_records_nothing(self):
+        histogram = metrics.Histogram('test_seconds', 'Test')
+        with histogram.time():
+            pass
+        assert histogram.count == 0
+
+    def test_registry_rejects_duplicates(self):
+        registry = metrics.Registry()
+        registry.counter('test_total', 'Test')
+        with pytest.raises(ValueError):
+            registry.counter('test_total', 'Test')
+
+    def test_fight_records_combat(self, enabled_metrics):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'],
+                           player2moves=['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'])
+        list(combat.fight())
+        assert metrics.TURNS.value() == 3
+        assert metrics.DEATHS.value() == 1
+        assert metrics.DRAWS.value() == 0
+        assert metrics.SPECIAL_ATTACKS.value(
+            character='Arnaldor Shuatseneguer', attack='Remuyuken') == 2
+        assert metrics.SPECIAL_ATTACKS.value(
+            character='Tonyn Stallone', attack='Taladoken') == 1
+
+    def test_resolve_records_draw(self, enabled_metrics):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=['W', 'A+K'],
+                           player2moves=['S'])
+        combat.resolve()
+        assert metrics.TURNS.value() == 2
+        assert metrics.DRAWS.value() == 1
+        assert metrics.SPECIAL_ATTACKS.value(
+            character='Tonyn Stallone', attack='Kick') == 1
+
+    def test_streamed_moves_record_combat(self, enabled_metrics):
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=iter(['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P']),
+                           player2moves=iter(['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P']))
+        list(combat.fight())
+        assert metrics.TURNS.value() == 3
+        assert metrics.DEATHS.value() == 1
+        assert metrics.SPECIAL_ATTACKS.value(
+            character='Arnaldor Shuatseneguer', attack='Remuyuken') == 2
+        assert metrics.SPECIAL_ATTACKS.value(
+            character='Tonyn Stallone', attack='Taladoken') == 1
+
+    def test_streamed_moves_use_constant_memory(self, enabled_metrics):
+        import itertools
+        import tracemalloc
+
+        def peak(turns: int) -> int:
+            combat = tk.Combat(player1=tk.TonynStallone(health=10 ** 9),
+                               player2=tk.ArnaldorShuatseneguer(health=10 ** 9),
+                               player1moves=itertools.repeat('P', turns),
+                               player2moves=itertools.repeat('K', turns))
+            tracemalloc.start()
+            combat.resolve()
+            result = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return result
+
+        # Special attacks are counted by character and attack, not kept.
+        assert peak(20000) < peak(2000) + 4096
+        assert metrics.SPECIAL_ATTACKS.value(character='Tonyn Stallone', attack='Punch') == 22000
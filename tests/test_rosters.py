@@ -0,0 +1,105 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import matchup
+from talanakombat import rosters
+from talanakombat import service
+
+ROSTER = {
+    'characters': {
+        'tonyn': tk.TonynStallone.TEMPLATE.to_dict(),
+        'golem': {'name': 'Golem', 'health': 20, 'special_attacks': {'WW+P': {'name': 'Smash', 'damage': 5}}},
+    },
+}
+
+TOML = b'''
+[defaults]
+player1 = "golem"
+
+[characters.golem]
+name = "Golem"
+health = 20
+special_attacks = { "WW+P" = { name = "Smash", damage = 5 } }
+'''
+
+
+class TestRosters:
+    def test_builtin(self):
+        assert rosters.BUILTIN.ids == ['tonyn', 'arnaldor']
+        player = rosters.BUILTIN.character()
+        assert type(player) is tk.TonynStallone
+        assert player.template is tk.TonynStallone.TEMPLATE
+        assert type(rosters.BUILTIN.character(player=2)) is tk.ArnaldorShuatseneguer
+
+    def test_loads_json_and_toml(self):
+        roster = rosters.loads(json.dumps(ROSTER).encode())
+        assert roster.ids == ['tonyn', 'golem']
+        assert roster.defaults == ('tonyn', 'golem')
+        golem = roster.character('golem')
+        assert golem.name == 'Golem'
+        assert golem.health == 20
+        assert golem.move_damage('WW+P') == 5
+
+        roster = rosters.loads(TOML, 'toml')
+        assert roster.defaults == ('golem', 'golem')
+
+    def test_cached_by_content(self):
+        content = json.dumps(ROSTER).encode()
+        roster = rosters.loads(content)
+        assert rosters.loads(content) is roster
+        assert roster.template('golem') is rosters.loads(content).template('golem')
+        assert pickle.loads(pickle.dumps(roster)) is roster
+        assert pickle.loads(pickle.dumps(rosters.BUILTIN)) is rosters.BUILTIN
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            rosters.loads(b'{"characters": {}}')
+        with pytest.raises(ValueError) as e:
+            rosters.loads(b'{"characters": {"x": {"name": "X", "health": 0, "special_attacks": {}}}}')
+        assert "'x'" in str(e.value)
+        with pytest.raises(ValueError):
+            rosters.loads(json.dumps({**ROSTER, 'defaults': {'player1': 'nobody'}}).encode())
+        with pytest.raises(ValueError):
+            rosters.loads(b'{}', 'yaml')
+        with pytest.raises(ValueError):
+            rosters.BUILTIN.character('golem')
+
+    def test_prepare_with_character_ids(self):
+        roster = rosters.loads(json.dumps(ROSTER).encode())
+        combat = service.prepare({
+            'player1': {'character': 'golem', 'movements': ['WW'], 'attacks': ['P']},
+            'jugador2': {'personaje': 'tonyn', 'movimientos': ['D'], 'golpes': ['K']},
+        }, roster)
+        assert combat.player1.name == 'Golem'
+        assert combat.player2.name == 'Tonyn Stallone'
+        assert service.play_combat(combat, narration=False)['player2']['health'] == 1
+
+    def test_roster_file_reloads(self, tmp_path):
+        path = str(tmp_path / 'roster.json')
+        with open(path, 'w') as target:
+            json.dump(ROSTER, target)
+        now = [0.0]
+        roster_file = rosters.RosterFile(path, interval=1, clock=lambda: now[0])
+        roster = roster_file.get()
+        matchup.get(roster.template('golem'), roster.template('tonyn'))
+
+        changed = {'characters': {**ROSTER['characters'], 'golem': {**ROSTER['characters']['golem'], 'health': 30}}}
+        with open(path, 'w') as target:
+            json.dump(changed, target)
+        os.utime(path, ns=(1, 1))
+        # The file is only checked again once the interval has passed.
+        assert roster_file.get() is roster
+        now[0] = 1.0
+        assert roster_file.get().character('golem').health == 30
+        assert len(matchup.matchups) == 0
+
+        with open(path, 'w') as target:
+            target.write('{')
+        os.utime(path, ns=(2, 2))
+        now[0] = 2.0
+        assert roster_file.get().character('golem').health == 30
+        assert roster_file.error.startswith('JSONDecodeError')
@@ -0,0 +1,99 @@
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import session
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSession:
+    def test_init_default_players(self):
+        live = session.Session()
+        assert live.state()['player1'] == {'name': 'Tonyn Stallone', 'health': 6}
+        assert live.state()['player2'] == {'name': 'Arnaldor Shuatseneguer', 'health': 6}
+        assert live.turns == 0
+        assert live.finished is False
+
+    def test_play_turns_matches_fight(self):
+        player1moves = ['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P']
+        player2moves = ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P']
+        combat = tk.Combat(player1=tk.TonynStallone(),
+                           player2=tk.ArnaldorShuatseneguer(),
+                           player1moves=list(player1moves),
+                           player2moves=list(player2moves),
+                           seed=1)
+        expected = list(combat.fight())
+
+        live = session.Session(seed=1)
+        narration = []
+        for player1move, player2move in zip(player1moves, player2moves):
+            result = live.play_turn(player1move, player2move)
+            narration += result['narration']
+            if result['finished']:
+                break
+
+        assert narration == expected
+        assert result['winner'] == 'Arnaldor Shuatseneguer'
+        assert result['player1']['health'] == 0
+        assert result['player2']['health'] == 2
+        assert result['turns'] == 3
+
+    def test_play_turn_after_finish(self):
+        live = session.Session()
+        live.finish()
+        with pytest.raises(ValueError):
+            live.play_turn('P', 'K')
+
+    def test_play_turn_invalid_move_leaves_state_untouched(self):
+        live = session.Session()
+        with pytest.raises(ValueError):
+            live.play_turn('P', 'XX+K')
+        assert live.turns == 0
+        assert live.state()['player2']['health'] == 6
+
+    def test_finish_is_a_draw(self):
+        live = session.Session()
+        live.play_turn('P', 'W')
+        result = live.finish()
+        assert result['narration'] == ['Combat ended in a draw']
+        assert result['finished'] is True
+        assert result['winner'] is None
+
+
+class TestSessionStore:
+    def test_create_and_get(self):
+        store = session.SessionStore()
+        live = store.create()
+        assert store.get(live.id) is live
+        assert store.get('missing') is None
+
+    def test_max_sessions(self):
+        store = session.SessionStore(max_sessions=2)
+        first = store.create()
+        store.create()
+        store.create()
+        assert store.get(first.id) is None
+        assert len(store) == 2
+
+    def test_ttl_counts_from_last_access(self):
+        clock = FakeClock()
+        store = session.SessionStore(ttl=10, clock=clock)
+        live = store.create()
+        clock.now = 8
+        assert store.get(live.id) is live
+        clock.now = 16
+        assert store.get(live.id) is live
+        clock.now = 30
+        assert store.get(live.id) is None
+
+    def test_delete(self):
+        store = session.SessionStore()
+        live = store.create()
+        assert store.delete(live.id) is live
+        assert store.get(live.id) is None
@@ -0,0 +1,74 @@
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import solver
+
+
+def play(player1moves, player2moves):
+    combat = tk.Combat(player1=tk.TonynStallone(),
+                       player2=tk.ArnaldorShuatseneguer(),
+                       player1moves=list(player1moves),
+                       player2moves=list(player2moves))
+    return combat.resolve()
+
+
+class TestSolver:
+    def test_legal_moves(self):
+        moves = solver.Solver.legal_moves(tk.TonynStallone())
+        assert len(moves) == 1365 * 3
+        assert 'DSD+P' in moves
+        assert 'WASDW+K' in moves
+
+    def test_legal_moves_include_special_attacks(self):
+        character = tk.BaseCharacter(
+            name='Test', health=1, special_attacks={'DD+PP': {'name': 'Double', 'damage': 2}})
+        assert 'DD+PP' in solver.Solver.legal_moves(character)
+
+    def test_move_classes_keep_every_damage(self):
+        classes = solver.Solver.move_classes(tk.TonynStallone())
+        assert set(classes.values()) == {0, 1, 2, 3}
+        assert list(classes.values()) == sorted(classes.values(), reverse=True)
+
+    def test_best_reply_as_player1(self):
+        player2moves = ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P']
+        result = solver.Solver().best_reply(player2moves, player=1)
+        assert result['value'] == 1
+        assert result['complete'] is True
+        assert play(result['moves'], player2moves)['winner'].name == 'Tonyn Stallone'
+
+    def test_best_reply_as_player2(self):
+        player1moves = ['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P']
+        result = solver.Solver().best_reply(player1moves)
+        assert result['value'] == 1
+        assert play(player1moves, result['moves'])['winner'].name == 'Arnaldor Shuatseneguer'
+
+    def test_best_reply_turns_lower_than_opponent_moves(self):
+        with pytest.raises(ValueError):
+            solver.Solver().best_reply(['P', 'P'], turns=1)
+
+    def test_best_reply_invalid_opponent_move(self):
+        with pytest.raises(ValueError):
+            solver.Solver().best_reply(['X+P'])
+
+    def test_value_single_turn_is_a_draw(self):
+        result = solver.Solver().value(1)
+        assert result['value'] == 0
+
+    def test_value_follows_principal_variation(self):
+        result = solver.Solver().value(4)
+        assert result['value'] == -1
+        outcome = play(result['player1moves'], result['player2moves'])
+        assert outcome['winner'].name == 'Arnaldor Shuatseneguer'
+
+    def test_value_budget_returns_deepest_completed_search(self):
+        result = solver.Solver(max_nodes=100).value(8)
+        assert result['complete'] is False
+        assert result['turns'] < 8
+
+    def test_value_budget_too_small(self):
+        with pytest.raises(tk.exceptions.SearchBudgetException):
+            solver.Solver(max_nodes=1).value(8)
+
+    def test_init_invalid_budget(self):
+        with pytest.raises(ValueError):
+            solver.Solver(max_nodes=0)
@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import stats
+
+
+@pytest.fixture
+def enabled_stats():
+    stats.STATS.clear()
+    stats.enable()
+    yield stats
+    stats.disable()
+    stats.STATS.clear()
+
+
+def play(player1moves, player2moves, narration=True):
+    combat = tk.Combat(player1=tk.TonynStallone(),
+                       player2=tk.ArnaldorShuatseneguer(),
+                       player1moves=player1moves,
+                       player2moves=player2moves)
+    if narration:
+        list(combat.fight())
+    else:
+        combat.resolve()
+
+
+class TestSketches:
+    def test_count_min_sketch_never_underestimates(self):
+        sketch = stats.CountMinSketch(width=64, depth=4)
+        rng = random.Random(0)
+        counts = {}
+        for _ in range(5000):
+            key = rng.randrange(1000)
+            counts[key] = counts.get(key, 0) + 1
+            sketch.add(key)
+        assert sketch.total == 5000
+        assert all(sketch.estimate(key) >= count for key, count in counts.items())
+
+    def test_top_k_finds_heavy_hitters(self):
+        top = stats.TopK(k=5, width=256, depth=4)
+        rng = random.Random(0)
+        for n in range(20000):
+            # Three frequent keys among thousands of rare ones.
+            top.add(('heavy', n % 3) if n % 4 == 0 else ('rare', rng.randrange(10 ** 6)))
+        assert len(top) == 5
+        assert {key for key, _ in top.items()[:3]} == {('heavy', 0), ('heavy', 1), ('heavy', 2)}
+        # No rare key shares all of its counters with a frequent one.
+        assert top.items()[3][1] < 500
+
+    def test_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            stats.CountMinSketch(width=0)
+        with pytest.raises(TypeError):
+            stats.TopK(k=1.5)
+
+
+class TestStats:
+    def test_disabled_by_default(self):
+        stats.STATS.clear()
+        play(['D+K'], ['SA+K'])
+        assert stats.STATS.combats == 0
+
+    def test_records_combats(self, enabled_stats):
+        play(['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'], ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'])
+        play(['W', 'A+K'], ['S'], narration=False)
+
+        summary = stats.STATS.to_dict()
+        assert summary['combats'] == 2
+        assert summary['draws'] == 1
+        assert summary['average_turns'] == 2.5
+        assert summary['characters']['Arnaldor Shuatseneguer'] == {
+            'combats': 2, 'wins': 1, 'losses': 0, 'draws': 1, 'win_rate': 0.5}
+        assert summary['special_attacks'] == {
+            'Tonyn Stallone': {'Kick': 2, 'Taladoken': 1},
+            'Arnaldor Shuatseneguer': {'Remuyuken': 2},
+        }
+        assert {'character': 'Tonyn Stallone', 'moves': ['D+K', 'DSD+P', 'S'], 'count': 1} in summary['openings']
+        assert {'character': 'Arnaldor Shuatseneguer', 'moves': ['S', ''], 'count': 1} in summary['openings']
+
+    def test_streamed_moves_match_lists(self, enabled_stats):
+        player1moves = ['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P']
+        player2moves = ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P']
+        play(player1moves, player2moves)
+        expected = stats.STATS.to_dict()
+        stats.STATS.clear()
+        play(iter(player1moves), iter(player2moves))
+        assert stats.STATS.to_dict() == expected
+
+    def test_metrics_and_stats_share_one_pass(self, enabled_stats, monkeypatch):
+        from talanakombat import metrics
+
+        calls = []
+        find_special_attack = metrics.find_special_attack
+
+        def counting(player, move):
+            calls.append(move)
+            return find_special_attack(player, move)
+
+        monkeypatch.setattr(metrics, 'find_special_attack', counting)
+        metrics.enable()
+        try:
+            play(['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'], ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'], narration=False)
+            play(iter(['D+K', 'DSD+P', 'S']), iter(['SA+K', 'SA', 'SA+K']))
+        finally:
+            metrics.disable()
+            metrics.REGISTRY.clear()
+        # Both combats end on turn 2, and each move played is looked at once
+        # for both features.
+        assert calls == ['D+K', 'SA+K', 'DSD+P', 'SA', 'S', 'SA+K'] * 2
+        assert stats.STATS.to_dict()['special_attacks']['Arnaldor Shuatseneguer'] == {'Remuyuken': 4}
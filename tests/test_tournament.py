@@ -0,0 +1,68 @@
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import tournament
+
+ROSTER = [
+    {'name': 'Tonyn Stallone', 'health': 6, 'special_attacks': {
+        'DSD+P': {'name': 'Taladoken', 'damage': 3},
+        'SD+K': {'name': 'Remuyuken', 'damage': 2},
+        'P': {'name': 'Punch', 'damage': 1},
+        'K': {'name': 'Kick', 'damage': 1},
+    }},
+    {'name': 'Arnaldor Shuatseneguer', 'health': 6, 'special_attacks': {
+        'ASA+P': {'name': 'Taladoken', 'damage': 2},
+        'SA+K': {'name': 'Remuyuken', 'damage': 3},
+        'P': {'name': 'Punch', 'damage': 1},
+        'K': {'name': 'Kick', 'damage': 1},
+    }},
+    {'name': 'Pacifist', 'health': 6, 'special_attacks': {
+        'P': {'name': 'Pat', 'damage': 1},
+    }},
+]
+
+MOVE_POOLS = {
+    'Tonyn Stallone': [
+        ['D+K', 'DSD+P', 'S', 'DSD+K', 'SD+P'],
+        ['DSD+P', 'DSD+P'],
+    ],
+    'Arnaldor Shuatseneguer': [
+        ['SA+K', 'SA', 'SA+K', 'ASA+P', 'SA+P'],
+    ],
+    'Pacifist': [
+        ['W', 'A', 'S'],
+    ],
+}
+
+
+class TestTournament:
+    def test_init_roster_too_small(self):
+        with pytest.raises(ValueError):
+            tournament.Tournament(ROSTER[:1], MOVE_POOLS)
+
+    def test_init_missing_move_pool(self):
+        with pytest.raises(ValueError):
+            tournament.Tournament(ROSTER, {'Tonyn Stallone': [['P']]})
+
+    def test_init_invalid_move(self):
+        with pytest.raises(ValueError):
+            tournament.Tournament(ROSTER, {**MOVE_POOLS, 'Pacifist': [['X']]})
+
+    def test_pairings(self):
+        assert tournament.Tournament(ROSTER, MOVE_POOLS).pairings() == [
+            (0, 1), (0, 2), (1, 2)]
+        assert len(tournament.Tournament(
+            ROSTER, MOVE_POOLS, swap_sides=True).pairings()) == 6
+
+    def test_run(self):
+        result = tournament.Tournament(
+            ROSTER, MOVE_POOLS, workers=1, chunksize=2).run()
+        assert result['names'] == [spec['name'] for spec in ROSTER]
+        assert result['wins'] == [[0, 1, 2], [1, 0, 1], [0, 0, 0]]
+        assert result['draws'] == [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+        assert result['losses'] == [[0, 1, 0], [1, 0, 0], [2, 1, 0]]
+
+    def test_run_in_process_pool(self):
+        tournament_ = tournament.Tournament(ROSTER, MOVE_POOLS, swap_sides=True)
+        assert tournament_.run() == tournament.Tournament(
+            ROSTER, MOVE_POOLS, workers=1, swap_sides=True).run()
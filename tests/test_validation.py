@@ -0,0 +1,65 @@
+import pytest
+
+from .context import talanakombat as tk
+from talanakombat import exceptions
+from talanakombat import service
+from talanakombat import validation
+
+
+class TestValidation:
+    def test_valid_moves(self):
+        errors = validation.validate(tk.TonynStallone(), tk.ArnaldorShuatseneguer(),
+                                     ['D+K', 'DSD+P', 'S', 'dsd+K', 'SD+P', ''],
+                                     ['SA+K', 'SA', 'SA+K', 'ASA+P'])
+        assert errors == []
+
+    def test_reports_every_invalid_move(self):
+        errors = validation.validate(tk.TonynStallone(), tk.ArnaldorShuatseneguer(),
+                                     ['D+K', 'X', 'WWWWWW'],
+                                     ['S', 5])
+        assert errors == [
+            {'turn': 1, 'player': 1, 'move': 'X', 'reason': 'Movements must be only W, A, S or D characters'},
+            {'turn': 1, 'player': 2, 'move': 5, 'reason': 'Move must be a string'},
+            {'turn': 2, 'player': 1, 'move': 'WWWWWW', 'reason': 'Movements must be 5 or less characters'},
+        ]
+
+    def test_grammar_follows_special_attacks(self):
+        # 'X' is only a move for characters with an 'X' combo.
+        template = tk.CharacterTemplate('Test', 6, {'X': {'name': 'Cross', 'damage': 1}})
+        player = tk.BaseCharacter.from_template(template)
+        assert validation.validate(player, player, ['DX'], ['SX']) == []
+        assert validation.validate(tk.TonynStallone(), tk.TonynStallone(), ['DX'], ['S']) != []
+
+    def test_errors_are_capped(self):
+        errors = validation.validate(tk.TonynStallone(), tk.ArnaldorShuatseneguer(),
+                                     ['X'] * 1000, ['Y'] * 1000)
+        assert len(errors) == validation.MAX_ERRORS
+
+    def test_prepare_rejects_before_playing(self):
+        data = {
+            'player1': {'movements': ['D', 'DSD', 'Q'], 'attacks': ['K', 'P', '']},
+            'player2': {'movements': ['SA'], 'attacks': ['K']},
+        }
+        with pytest.raises(exceptions.InvalidMovesException) as e:
+            service.prepare(data)
+        assert str(e.value) == 'Invalid move for player 1 on turn 2: Movements must be only W, A, S or D characters'
+        assert service.play_safely(data)['errors'] == [
+            {'turn': 2, 'player': 1, 'move': 'Q', 'reason': 'Movements must be only W, A, S or D characters'},
+        ]
+
+    def test_rejects_empty_sides(self):
+        data = {
+            'player1': {'movements': [], 'attacks': []},
+            'player2': {'movements': ['SA'], 'attacks': ['K']},
+        }
+        with pytest.raises(exceptions.InvalidMovesException) as e:
+            service.prepare(data)
+        assert str(e.value) == 'Player 1 has no moves'
+        assert service.play_safely(data, narration=False)['errors'] == [
+            {'turn': None, 'player': 1, 'move': None, 'reason': 'Moves must be a non empty list'},
+        ]
+
+        combat = tk.Combat(player1=tk.TonynStallone(), player2=tk.ArnaldorShuatseneguer())
+        with pytest.raises(exceptions.InvalidMovesException) as e:
+            validation.check_combat(combat)
+        assert [error['player'] for error in e.value.errors] == [1, 2]